@@ -1,5 +1,6 @@
-from ninja import NinjaAPI
+from ninja import NinjaAPI, Schema
 
+from app.cache import get_result_cache
 from y2022.api import router as y2022_router
 
 api = NinjaAPI(
@@ -9,3 +10,16 @@ api = NinjaAPI(
 )
 
 api.add_router('year/2022', y2022_router)
+
+
+class CacheStats(Schema):
+    hits: int
+    misses: int
+
+
+@api.get('/cache/stats', response=CacheStats, summary='Solutions cache statistics', tags=['cache'])
+def cache_stats(request):
+    """
+    Provides hit and miss counters of solutions cache in current process
+    """
+    return get_result_cache().stats()
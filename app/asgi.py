@@ -14,3 +14,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_asgi_application()
+
+from app.executors import warm_up_executors  # noqa: E402 settings have to be configured first
+from app.registry import warm_up_resolvers  # noqa: E402
+
+# Resolvers go first, so pre-forked workers inherit already imported modules
+warm_up_resolvers()
+warm_up_executors()
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from ninja import UploadedFile
+
+from app.models import Solution
+from app.uploads import StreamedUploadedFile
+
+if TYPE_CHECKING:
+    from y2022.service import Resolver
+
+DEFAULT_TIMEOUT = 60 * 60 * 24
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class ResultCacheBackend:
+    """
+    Storage for serialized solutions. Value is a list of plain dicts, so it can be pickled or dumped to JSON.
+    """
+
+    def __init__(self, timeout: Optional[int] = DEFAULT_TIMEOUT, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.timeout = timeout
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[list]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: list) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def _expires_at(self) -> Optional[float]:
+        return None if self.timeout is None else time.time() + self.timeout
+
+
+class LocalMemoryBackend(ResultCacheBackend):
+    """
+    In-process LRU. Every worker process keeps its own copy.
+    """
+
+    def __init__(self, timeout: Optional[int] = DEFAULT_TIMEOUT, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        super().__init__(timeout, max_entries)
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[list]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.__entries[key]
+                return None
+
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: list) -> None:
+        with self.__lock:
+            self.__entries[key] = (self._expires_at(), value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+
+class DjangoCacheBackend(ResultCacheBackend):
+    """
+    Delegates to one of configured `CACHES`, e.g. `app_cache_table` database cache.
+    Size bound is then controlled by cache `OPTIONS.MAX_ENTRIES` and `CULL_FREQUENCY`.
+    """
+
+    def __init__(self, timeout: Optional[int] = DEFAULT_TIMEOUT, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 alias: str = 'default') -> None:
+        super().__init__(timeout, max_entries)
+        self.__alias = alias
+
+    def get(self, key: str) -> Optional[list]:
+        return caches[self.__alias].get(key)
+
+    def set(self, key: str, value: list) -> None:
+        caches[self.__alias].set(key, value, timeout=self.timeout)
+
+    def clear(self) -> None:
+        caches[self.__alias].clear()
+
+
+class FileBackend(ResultCacheBackend):
+    """
+    One JSON file per key. Survives restarts and is shared by all workers on the host.
+    """
+
+    def __init__(self, timeout: Optional[int] = DEFAULT_TIMEOUT, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 location: str = None) -> None:
+        super().__init__(timeout, max_entries)
+        self.__location = Path(location or settings.BASE_DIR / 'solutions_cache')
+
+    def get(self, key: str) -> Optional[list]:
+        path = self.__get_path(key)
+        try:
+            with path.open('r') as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        if entry['expires_at'] is not None and entry['expires_at'] <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+
+        # mtime doubles as last access time for eviction
+        os.utime(path)
+        return entry['value']
+
+    def set(self, key: str, value: list) -> None:
+        self.__location.mkdir(parents=True, exist_ok=True)
+        path = self.__get_path(key)
+        temporary_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        with temporary_path.open('w') as cache_file:
+            json.dump({'expires_at': self._expires_at(), 'value': value}, cache_file)
+        os.replace(temporary_path, path)
+        self.__evict()
+
+    def clear(self) -> None:
+        for path in self.__location.glob('*.json'):
+            path.unlink(missing_ok=True)
+
+    def __get_path(self, key: str) -> Path:
+        return self.__location / f'{key}.json'
+
+    def __evict(self) -> None:
+        entries = list(self.__location.glob('*.json'))
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda path: path.stat().st_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            path.unlink(missing_ok=True)
+
+
+class ResolvedInput:
+    """
+    Solutions of uploaded input together with its line count, which is counted while input is hashed,
+    and whether solutions came from cache.
+    """
+
+    def __init__(self, solutions: List[Solution], input_lines: int, hit: bool) -> None:
+        self.solutions = solutions
+        self.input_lines = input_lines
+        self.hit = hit
+
+
+class ResultCache:
+    """
+    Content-addressed cache of resolver results.
+    Key is built from year, day, resolver version and SHA-256 of uploaded bytes.
+    """
+
+    def __init__(self, backend: ResultCacheBackend) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+    def resolve(self, year: int, day: int, resolver: 'Resolver', problem_input: UploadedFile,
+                run: Callable[['Resolver', UploadedFile], List[Solution]] = None) -> ResolvedInput:
+        digest, input_lines = self.scan_input(problem_input)
+        key = self.make_key(year, day, resolver, digest)
+
+        cached = self.get(key)
+        if cached is not None:
+            return ResolvedInput(cached, input_lines, hit=True)
+
+        solutions = run(resolver, problem_input) if run else resolver.resolve(problem_input)
+        self.set(key, solutions)
+        return ResolvedInput(solutions, input_lines, hit=False)
+
+    async def resolve_async(self, year: int, day: int, resolver: 'Resolver', problem_input: UploadedFile,
+                            run: Callable[['Resolver', UploadedFile], Awaitable[List[Solution]]]) -> ResolvedInput:
+        # Hashing reads whole upload, so it goes to worker thread instead of the one serving database access
+        digest, input_lines = await sync_to_async(self.scan_input, thread_sensitive=False)(problem_input)
+        key = self.make_key(year, day, resolver, digest)
+
+        cached = await sync_to_async(self.get)(key)
+        if cached is not None:
+            return ResolvedInput(cached, input_lines, hit=True)
+
+        solutions = await run(resolver, problem_input)
+        await sync_to_async(self.set)(key, solutions)
+        return ResolvedInput(solutions, input_lines, hit=False)
+
+    def get(self, key: str) -> Optional[List[Solution]]:
+        cached = self.backend.get(key)
+        self.__count(hit=cached is not None)
+        if cached is None:
+            return None
+        return [Solution(**solution) for solution in cached]
+
+    def set(self, key: str, solutions: List[Solution]) -> None:
+        self.backend.set(key, [solution.dict() for solution in solutions])
+
+    def make_key(self, year: int, day: int, resolver: 'Resolver', digest: str) -> str:
+        key = f'solution-{year}-{day}-v{resolver.version}-{digest}'
+        options = resolver.get_options()
+        if options:
+            # Same input solved with different options has different solutions
+            options_digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()[:16]
+            key = f'{key}-{options_digest}'
+        return key
+
+    def scan_input(self, problem_input: UploadedFile) -> Tuple[str, int]:
+        # SHA-256 and line count of upload in one reading, streamed upload got both while it was read
+        if isinstance(problem_input, StreamedUploadedFile):
+            return problem_input.digest, problem_input.line_count
+
+        digest = hashlib.sha256()
+        line_count = 0
+        for chunk in problem_input.chunks():
+            digest.update(chunk)
+            line_count += chunk.count(b'\n')
+        problem_input.seek(0)
+        return digest.hexdigest(), line_count
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def __count(self, hit: bool) -> None:
+        with self.__lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+@lru_cache(maxsize=None)
+def get_result_cache() -> ResultCache:
+    config = getattr(settings, 'SOLUTIONS_CACHE', {})
+    backend_class = import_string(config.get('BACKEND', 'app.cache.LocalMemoryBackend'))
+    options = {key.lower(): value for key, value in config.get('OPTIONS', {}).items()}
+    backend = backend_class(
+        timeout=config.get('TIMEOUT', DEFAULT_TIMEOUT),
+        max_entries=config.get('MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+        **options
+    )
+    return ResultCache(backend)
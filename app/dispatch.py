@@ -0,0 +1,185 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import AsyncGenerator, Callable, Generator, List, Union
+
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import StreamingHttpResponse
+from ninja.errors import HttpError
+from ninja.files import UploadedFile
+
+from app.cache import get_result_cache
+from app.executors import ExecutionTimeout, ExecutorSaturated, TooManySolves, get_async_executor, get_executor, \
+    get_solve_limiter
+from app.metrics import get_metrics, profile
+from app.models import BatchItemResult, Solution
+from app.registry import InvalidResolverOptions, ResolverNotFound, get_registry
+from app.uploads import StreamedUploadedFile
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+ERROR_STATUSES = {
+    ResolverNotFound: 404,
+    InvalidResolverOptions: 422,
+    TooManySolves: 429,
+    ExecutorSaturated: 503,
+    ExecutionTimeout: 504,
+}
+
+
+@contextmanager
+def solving(year: int, day: int):
+    try:
+        yield
+    except tuple(ERROR_STATUSES) as error:
+        status = ERROR_STATUSES[type(error)]
+        get_metrics().observe_error(year, day, status)
+        raise HttpError(status, str(error))
+
+
+async def solve_async(year: int, day: int, problem_input: UploadedFile, options: dict) -> List[Solution]:
+    started = time.perf_counter()
+    with solving(year, day):
+        resolver = get_registry().create(year, day, **options)
+        executor = get_async_executor(resolver.execution_backend)
+        with get_solve_limiter().slot():
+            resolved = await get_result_cache().resolve_async(
+                year, day, resolver, problem_input, executor.resolve_async
+            )
+
+    get_metrics().observe_solve(year, day, resolver.timings, time.perf_counter() - started, problem_input.size,
+                                resolved.input_lines, resolved.hit)
+    return resolved.solutions
+
+
+async def get_streamed_solutions(resolver, problem_input: StreamedUploadedFile) -> List[Solution]:
+    return problem_input.get_solutions()
+
+
+async def solve_streamed_async(year: int, day: int, problem_input: StreamedUploadedFile) -> List[Solution]:
+    # Upload was solved while it was read, cache only stores its solutions for days which are not streamed
+    started = time.perf_counter()
+    resolver = problem_input.resolver
+    with solving(year, day):
+        resolved = await get_result_cache().resolve_async(
+            year, day, resolver, problem_input, get_streamed_solutions
+        )
+
+    solve_seconds = time.perf_counter() - started + sum(resolver.timings.values())
+    get_metrics().observe_solve(year, day, resolver.timings, solve_seconds, problem_input.size,
+                                resolved.input_lines, resolved.hit)
+    return resolved.solutions
+
+
+async def profile_async(year: int, day: int, problem_input: UploadedFile, options: dict) -> dict:
+    # Profiler only sees the thread it runs in, so resolver is run right there bypassing cache and executors
+    with solving(year, day):
+        resolver = get_registry().create(year, day, **options)
+        with get_solve_limiter().slot():
+            solutions, summary = await sync_to_async(profile, thread_sensitive=False)(resolver.resolve, problem_input)
+    return {'solutions': solutions, 'timings': resolver.timings, 'profile': summary}
+
+
+async def solve_day_async(year: int, day: int, request, problem_input: UploadedFile,
+                          profiled: bool) -> Union[List[Solution], dict]:
+    if isinstance(problem_input, StreamedUploadedFile):
+        return await solve_streamed_async(year, day, problem_input)
+
+    options = get_resolver_options(request)
+    if profiled:
+        return await profile_async(year, day, problem_input, options)
+    return await solve_async(year, day, problem_input, options)
+
+
+def get_resolver_options(request) -> dict:
+    # Query parameters not handled by the endpoint itself are passed to resolver, repeated ones as list
+    return {key: values if len(values) > 1 else values[0] for key, values in request.GET.lists() if key != 'profile'}
+
+
+def create_streaming_resolver(year: int, request, day: str):
+    # Profiled runs need whole upload at hand, invalid requests are left for the endpoint to reject
+    if 'profile' in request.GET:
+        return None
+    try:
+        resolver = get_registry().create(year, int(day), **get_resolver_options(request))
+    except (ValueError, ResolverNotFound, InvalidResolverOptions):
+        return None
+    # Streamed upload is solved by the thread reading it, days solved on pooled workers keep their executor
+    if not resolver.streaming or not get_executor(resolver.execution_backend).runs_inline:
+        return None
+    return resolver
+
+
+async def solve_batch_item(year: int, index: int, day, problem_input, options: dict) -> dict:
+    # Any failure is reported for this item only, rest of the batch is still solved. Batch items are admitted
+    # one by one, the same way as day requests
+    try:
+        if isinstance(problem_input, Exception):
+            raise problem_input
+
+        day = int(day)
+        solutions = await solve_async(year, day, problem_input, options)
+        return BatchItemResult(index=index, day=day, solutions=solutions).dict()
+    except Exception as error:
+        # Day which is not a number is left out, so failed item can always be reported
+        day = day if isinstance(day, int) else None
+        return BatchItemResult(index=index, day=day, error=f'{type(error).__name__}: {error}').dict()
+
+
+def get_max_batch_items() -> int:
+    return getattr(settings, 'BATCH_SOLVES', {}).get('MAX_ITEMS', 100)
+
+
+def read_batch_items(request) -> Generator:
+    max_items = get_max_batch_items()
+    if request.content_type == NDJSON_CONTENT_TYPE:
+        lines = [line for line in request.body.splitlines() if line.strip()]
+        if len(lines) > max_items:
+            raise HttpError(413, f'Batch accepts at most {max_items} items')
+        for line in lines:
+            try:
+                item = json.loads(line)
+                day, options = item['day'], item.get('options', {})
+                problem_input = SimpleUploadedFile(f'day{day}.txt', item['input'].encode())
+            except Exception as error:
+                day, problem_input, options = None, ValueError(f'Invalid batch line: {error}'), {}
+            yield day, problem_input, options
+    elif request.content_type == 'multipart/form-data':
+        days = request.POST.getlist('days')
+        problem_inputs = request.FILES.getlist('problem_inputs')
+        if len(days) != len(problem_inputs):
+            raise HttpError(422, 'Each of `problem_inputs` requires matching `days` entry')
+        if len(days) > max_items:
+            raise HttpError(413, f'Batch accepts at most {max_items} items')
+        for day, problem_input in zip(days, problem_inputs):
+            yield day, problem_input, {}
+    else:
+        raise HttpError(415, f'Batch accepts `multipart/form-data` or `{NDJSON_CONTENT_TYPE}` payload')
+
+
+async def stream_batch(year: int, items: List) -> AsyncGenerator:
+    for index, (day, problem_input, options) in enumerate(items):
+        yield json.dumps(await solve_batch_item(year, index, day, problem_input, options)) + '\n'
+
+
+async def solve_batch_async(year: int, request, stream: bool) -> Union[List[dict], StreamingHttpResponse]:
+    # Reading body parses multipart form or spooled upload, so it happens in worker thread
+    items = await sync_to_async(lambda: list(read_batch_items(request)), thread_sensitive=False)()
+    if stream:
+        if django.VERSION >= (4, 2):
+            return StreamingHttpResponse(stream_batch(year, items), content_type=NDJSON_CONTENT_TYPE)
+        # Older Django iterates streaming response synchronously on event loop, so lines are solved up front
+        lines = [line async for line in stream_batch(year, items)]
+        return StreamingHttpResponse(lines, content_type=NDJSON_CONTENT_TYPE)
+    return [await solve_batch_item(year, index, day, problem_input, options)
+            for index, (day, problem_input, options) in enumerate(items)]
+
+
+async def report_async(year: int, day: int, report: Callable[..., List[dict]], *args) -> List[dict]:
+    # Reports parse input right in worker thread, bypassing cache and executors
+    with solving(year, day):
+        with get_solve_limiter().slot():
+            return await sync_to_async(report, thread_sensitive=False)(*args)
@@ -0,0 +1,352 @@
+import asyncio
+import os
+import threading
+import time
+from abc import abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils.module_loading import import_string
+from ninja import UploadedFile
+
+from app.models import Part, Solution
+
+if TYPE_CHECKING:
+    from y2022.service import Resolver
+
+
+class ExecutorSaturated(Exception):
+    pass
+
+
+class ExecutionTimeout(Exception):
+    pass
+
+
+class TooManySolves(Exception):
+    pass
+
+
+# Jobs return resolver timings next to result, since resolver in worker process is only a copy
+
+
+def resolve_job(resolver: 'Resolver', problem_input: Union[UploadedFile, bytes]) -> Tuple[List[Solution], dict]:
+    if isinstance(problem_input, bytes):
+        problem_input = SimpleUploadedFile('problem_input', problem_input)
+    return resolver.resolve(problem_input), resolver.timings
+
+
+def parse_job(resolver: 'Resolver', problem_input: Union[UploadedFile, bytes]) -> Tuple[Any, dict]:
+    if isinstance(problem_input, bytes):
+        problem_input = SimpleUploadedFile('problem_input', problem_input)
+    return resolver.measure('parse', resolver.parse, problem_input), resolver.timings
+
+
+def solve_part_job(resolver: 'Resolver', part: Part, parsed_input) -> Tuple[Solution, dict]:
+    return resolver.solve_part(part, parsed_input), resolver.timings
+
+
+def warm_up_job() -> None:
+    pass
+
+
+class SolverExecutor:
+    """
+    Runs resolvers with bounded amount of in-flight jobs. When all workers are busy and queue is full
+    submission fails immediately with `ExecutorSaturated` instead of piling up requests.
+    """
+    # Job is run by the submitting thread, so async code must not use it directly
+    runs_inline = False
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 0,
+                 timeout: Optional[float] = None) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        # Without workers limit job runs right away, so there is nothing to bound
+        self.__slots = None if max_workers is None else threading.BoundedSemaphore(max_workers + max_queue)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if self.__slots is None:
+            return self._submit(fn, *args)
+
+        if not self.__slots.acquire(blocking=False):
+            raise ExecutorSaturated(f'All {self.max_workers} workers are busy and queue of {self.max_queue} is full')
+
+        try:
+            future = self._submit(fn, *args)
+        except BaseException:
+            self.__slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self.__slots.release())
+        return future
+
+    def resolve(self, resolver: 'Resolver', problem_input: UploadedFile) -> List[Solution]:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        if not resolver.parallel_parts:
+            future = self.submit(resolve_job, resolver, self._pack_input(problem_input))
+            return self.__wait(resolver, future, deadline)
+
+        parsed_input = resolver.measure('parse', resolver.parse, problem_input)
+        part_two_input = resolver.copy_parsed_input(parsed_input)
+        futures = [self.submit(solve_part_job, resolver, Part.ONE, parsed_input)]
+        try:
+            futures.append(self.submit(solve_part_job, resolver, Part.TWO, part_two_input))
+            return [self.__wait(resolver, future, deadline) for future in futures]
+        except BaseException:
+            for future in futures:
+                self._abandon(future)
+            raise
+
+    async def resolve_async(self, resolver: 'Resolver', problem_input: UploadedFile) -> List[Solution]:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        packed_input = await sync_to_async(self._pack_input, thread_sensitive=False)(problem_input)
+
+        if not resolver.parallel_parts:
+            return await self.__wait_async(resolver, self.submit(resolve_job, resolver, packed_input), deadline)
+
+        parsed_input = await self.__wait_async(resolver, self.submit(parse_job, resolver, packed_input), deadline)
+        part_two_input = resolver.copy_parsed_input(parsed_input)
+        futures = [self.submit(solve_part_job, resolver, Part.ONE, parsed_input)]
+        try:
+            futures.append(self.submit(solve_part_job, resolver, Part.TWO, part_two_input))
+            waits = [self.__wait_async(resolver, future, deadline) for future in futures]
+            return list(await asyncio.gather(*waits))
+        except BaseException:
+            for future in futures:
+                self._abandon(future)
+            raise
+
+    def saturated(self) -> bool:
+        if self.__slots is None:
+            return False
+        if not self.__slots.acquire(blocking=False):
+            return True
+        self.__slots.release()
+        return False
+
+    def warm_up(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+    @abstractmethod
+    def _submit(self, fn: Callable, *args) -> Future:
+        pass
+
+    def _pack_input(self, problem_input: UploadedFile) -> Union[UploadedFile, bytes]:
+        return problem_input
+
+    def _abandon(self, future: Future) -> None:
+        # Only job which is still queued can be cancelled, already running one finishes in background and keeps
+        # its slot until then
+        future.cancel()
+
+    def __wait(self, resolver: 'Resolver', future: Future, deadline: Optional[float]):
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            result, timings = future.result(timeout=timeout)
+            resolver.timings.update(timings)
+            return result
+        except TimeoutError:
+            self._abandon(future)
+            raise ExecutionTimeout(f'Solving did not finish in {self.timeout} seconds')
+
+    async def __wait_async(self, resolver: 'Resolver', future: Future, deadline: Optional[float]):
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            # Cancelling wrapped future on timeout cancels the job as well, if it has not started yet
+            result, timings = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+            resolver.timings.update(timings)
+            return result
+        except asyncio.TimeoutError:
+            self._abandon(future)
+            raise ExecutionTimeout(f'Solving did not finish in {self.timeout} seconds')
+
+
+class InlineExecutor(SolverExecutor):
+    """
+    Runs job in calling thread, as if there was no executor at all.
+    Job is already finished when timeout is checked, so it never expires.
+    """
+    runs_inline = True
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
+
+
+class ThreadExecutor(SolverExecutor):
+    """
+    Keeps request thread free while solving, but resolvers still share GIL.
+    Running thread can not be stopped, so job which timed out holds its worker until it finishes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 0,
+                 timeout: Optional[float] = None) -> None:
+        super().__init__(max_workers or os.cpu_count(), max_queue, timeout)
+        self.__pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='solver')
+
+    def shutdown(self) -> None:
+        self.__pool.shutdown(cancel_futures=True)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        return self.__pool.submit(fn, *args)
+
+
+class ProcessExecutor(SolverExecutor):
+    """
+    Solves in separate processes, so CPU heavy days are not limited by GIL.
+    Input is sent to worker as bytes and parsed input or solutions are pickled back and forth.
+
+    Every worker process is driven by its own dispatcher thread. Process running job which timed out is killed and
+    replaced, only then the job stops counting against workers and queue.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 0,
+                 timeout: Optional[float] = None) -> None:
+        super().__init__(max_workers or os.cpu_count(), max_queue, timeout)
+        self.__dispatcher = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='solver-dispatch')
+        self.__worker = threading.local()
+        self.__pools = set()
+        # Future completed once waiting side gave up on job, by job future
+        self.__abandoned = {}
+        self.__lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        # Processes start lazily, so fork all of them now instead of on first requests. Barrier makes every
+        # dispatcher thread take one warm up job
+        barrier = threading.Barrier(self.max_workers)
+        futures = [self.__dispatcher.submit(self.__warm_up_worker, barrier) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        self.__dispatcher.shutdown(cancel_futures=True)
+        with self.__lock:
+            pools = list(self.__pools)
+        for pool in pools:
+            pool.shutdown(cancel_futures=True)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        abandoned = Future()
+        future = self.__dispatcher.submit(self.__run, abandoned, fn, *args)
+        with self.__lock:
+            self.__abandoned[future] = abandoned
+        future.add_done_callback(self.__forget)
+        return future
+
+    def _abandon(self, future: Future) -> None:
+        if future.cancel():
+            return
+        with self.__lock:
+            abandoned = self.__abandoned.get(future)
+        if abandoned is not None and not abandoned.done():
+            abandoned.set_result(None)
+
+    def _pack_input(self, problem_input: UploadedFile) -> bytes:
+        return b''.join(problem_input.chunks())
+
+    def __run(self, abandoned: Future, fn: Callable, *args):
+        job = self.__get_pool().submit(fn, *args)
+        wait([job, abandoned], return_when=FIRST_COMPLETED)
+        if not job.done():
+            self.__replace_pool()
+            raise ExecutionTimeout('Solving was abandoned')
+        if isinstance(job.exception(), BrokenProcessPool):
+            # Worker process died (e.g. was killed for memory), next job gets a new one
+            self.__replace_pool()
+        return job.result()
+
+    def __warm_up_worker(self, barrier: threading.Barrier) -> None:
+        barrier.wait()
+        self.__get_pool().submit(warm_up_job).result()
+
+    def __get_pool(self) -> ProcessPoolExecutor:
+        pool = getattr(self.__worker, 'pool', None)
+        if pool is None:
+            pool = self.__worker.pool = ProcessPoolExecutor(max_workers=1)
+            with self.__lock:
+                self.__pools.add(pool)
+        return pool
+
+    def __replace_pool(self) -> None:
+        pool = self.__worker.pool
+        self.__worker.pool = None
+        with self.__lock:
+            self.__pools.discard(pool)
+        # Executor has no way to stop running job, so its only process is killed
+        for process in list(pool._processes.values()):
+            process.kill()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    def __forget(self, future: Future) -> None:
+        with self.__lock:
+            self.__abandoned.pop(future, None)
+
+
+@lru_cache(maxsize=None)
+def get_executor(name: str) -> SolverExecutor:
+    config = getattr(settings, 'SOLVER_EXECUTORS', {}).get(name, {'BACKEND': 'app.executors.InlineExecutor'})
+    executor_class = import_string(config['BACKEND'])
+    return executor_class(
+        max_workers=config.get('MAX_WORKERS'),
+        max_queue=config.get('MAX_QUEUE', 0),
+        timeout=config.get('TIMEOUT'),
+    )
+
+
+class SolveLimiter:
+    """
+    Caps amount of solves admitted at once, counting time spent on reading input, waiting for worker and solving.
+    Requests over the limit are rejected right away with `TooManySolves`, so they do not queue up on event loop.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self.__lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        with self.__lock:
+            if self.active >= self.max_concurrent:
+                raise TooManySolves(f'Limit of {self.max_concurrent} concurrent solves is reached')
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self.__lock:
+                self.active -= 1
+
+
+@lru_cache(maxsize=None)
+def get_solve_limiter() -> SolveLimiter:
+    return SolveLimiter(getattr(settings, 'ASYNC_SOLVES', {}).get('MAX_CONCURRENT', 64))
+
+
+def get_async_executor(name: str) -> SolverExecutor:
+    # Inline executor would run resolver right on event loop, so such days are moved to offload executor instead
+    executor = get_executor(name)
+    if executor.runs_inline:
+        return get_executor(getattr(settings, 'ASYNC_SOLVES', {}).get('OFFLOAD_EXECUTOR', 'thread'))
+    return executor
+
+
+def warm_up_executors() -> None:
+    for name, config in getattr(settings, 'SOLVER_EXECUTORS', {}).items():
+        if config.get('PREFORK', False):
+            get_executor(name).warm_up()
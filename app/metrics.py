@@ -0,0 +1,133 @@
+import bisect
+import cProfile
+import io
+import pstats
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from django.http import HttpResponse
+
+from app.cache import get_result_cache
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1 << 10, 1 << 14, 1 << 17, 1 << 20, 1 << 23, 1 << 26, 1 << 30)
+LINES_BUCKETS = (10, 100, 1000, 10000, 100000, 1000000, 10000000)
+
+
+class Histogram:
+
+    def __init__(self, buckets: Tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Per-process counters and histograms exposed in Prometheus text format.
+    When application runs several worker processes, each of them reports its own numbers.
+    """
+
+    def __init__(self) -> None:
+        self.__counters: Dict[Tuple[str, Tuple], float] = {}
+        self.__histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.__help: Dict[str, Tuple[str, str]] = {}
+        self.__lock = threading.Lock()
+
+    def increment(self, name: str, labels: dict, value: float = 1, description: str = '') -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            self.__help.setdefault(name, ('counter', description))
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict, value: float, buckets: Tuple, description: str = '') -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            self.__help.setdefault(name, ('histogram', description))
+            if key not in self.__histograms:
+                self.__histograms[key] = Histogram(buckets)
+            self.__histograms[key].observe(value)
+
+    def observe_solve(self, year: int, day: int, timings: dict, total: float, input_bytes: int,
+                      input_lines: int, cache_hit: bool) -> None:
+        labels = {'year': year, 'day': day}
+        self.increment('solver_requests_total', {**labels, 'cache': 'hit' if cache_hit else 'miss'},
+                       description='Solved requests')
+        self.observe('solver_request_seconds', labels, total, SECONDS_BUCKETS,
+                     description='Time to answer request including cache lookup')
+        for stage, seconds in timings.items():
+            self.observe('solver_stage_seconds', {**labels, 'stage': stage}, seconds, SECONDS_BUCKETS,
+                         description='Time spent in resolver stage')
+        self.observe('solver_input_bytes', labels, input_bytes, BYTES_BUCKETS, description='Uploaded input size')
+        self.observe('solver_input_lines', labels, input_lines, LINES_BUCKETS, description='Uploaded input lines')
+
+    def observe_error(self, year: int, day: int, status: int) -> None:
+        self.increment('solver_errors_total', {'year': year, 'day': day, 'status': status},
+                       description='Requests failed with error status')
+
+    def render(self) -> str:
+        lines = []
+        with self.__lock:
+            for name, (metric_type, description) in sorted(self.__help.items()):
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                if metric_type == 'counter':
+                    for (counter_name, labels), value in sorted(self.__counters.items()):
+                        if counter_name == name:
+                            lines.append(f'{name}{self.__format_labels(labels)} {value}')
+                else:
+                    for (histogram_name, labels), histogram in sorted(self.__histograms.items()):
+                        if histogram_name == name:
+                            lines.extend(self.__render_histogram(name, labels, histogram))
+
+        cache_stats = get_result_cache().stats()
+        lines.append('# HELP solver_cache_hits_total Solutions served from cache')
+        lines.append('# TYPE solver_cache_hits_total counter')
+        lines.append(f'solver_cache_hits_total {cache_stats["hits"]}')
+        lines.append('# HELP solver_cache_misses_total Solutions missing in cache')
+        lines.append('# TYPE solver_cache_misses_total counter')
+        lines.append(f'solver_cache_misses_total {cache_stats["misses"]}')
+        return '\n'.join(lines) + '\n'
+
+    def __render_histogram(self, name: str, labels: Tuple, histogram: Histogram) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{self.__format_labels(labels + (("le", bound),))} {cumulative}')
+        lines.append(f'{name}_sum{self.__format_labels(labels)} {histogram.sum}')
+        lines.append(f'{name}_count{self.__format_labels(labels)} {histogram.count}')
+        return lines
+
+    def __format_labels(self, labels: Iterable[Tuple]) -> str:
+        labels = list(labels)
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+@lru_cache(maxsize=None)
+def get_metrics() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+def profile(fn, *args, limit: int = 30):
+    """
+    Runs function under cProfile and returns its result together with text summary sorted by cumulative time.
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args)
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).strip_dirs().sort_stats('cumulative').print_stats(limit)
+    return result, summary.getvalue()
+
+
+def metrics_view(request) -> HttpResponse:
+    return HttpResponse(get_metrics().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,43 @@
+from enum import Enum
+from typing import Dict, List, Optional, Union
+
+from ninja import Schema
+from pydantic import Extra
+
+
+# Models shared by all years
+class Part(Enum):
+    ONE = 1
+    TWO = 2
+
+
+class Solution(Schema):
+    part: int
+    result: Union[int, str]
+
+
+class BatchItemResult(Schema):
+    index: int
+    day: Optional[int]
+    solutions: Optional[List[Solution]]
+    error: Optional[str]
+
+
+class ProfiledSolutions(Schema):
+    solutions: List[Solution]
+    timings: Dict[str, float]
+    profile: str
+
+
+class ResolverOptions(Schema):
+    class Config:
+        extra = Extra.forbid
+
+
+def split_comma_separated(values):
+    # List given in query parameters may be separated by comma too, e.g. `knots=1,9`
+    if isinstance(values, str):
+        values = [values]
+    if isinstance(values, list):
+        return [item for value in values for item in (value.split(',') if isinstance(value, str) else [value])]
+    return values
@@ -0,0 +1,87 @@
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Tuple, Type
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from pydantic import ValidationError
+
+if TYPE_CHECKING:
+    from y2022.service import Resolver
+
+
+class ResolverNotFound(Exception):
+    pass
+
+
+class InvalidResolverOptions(Exception):
+    pass
+
+
+class ResolverRegistry:
+    """
+    Maps (year, day) to resolver class. Resolver modules are imported on first use of any of their days,
+    so startup does not depend on how many days and years are solved.
+
+    Unless registered explicitly, resolver is looked up by convention as `y<year>.service.Day<day>Resolver`.
+    """
+
+    def __init__(self) -> None:
+        self.__paths: Dict[Tuple[int, int], str] = {}
+        self.__resolvers: Dict[Tuple[int, int], Type['Resolver']] = {}
+        self.__lock = threading.Lock()
+
+    def register(self, year: int, day: int, path: str) -> None:
+        with self.__lock:
+            self.__paths[(year, day)] = path
+            self.__resolvers.pop((year, day), None)
+
+    def get(self, year: int, day: int) -> Type['Resolver']:
+        resolver_class = self.__resolvers.get((year, day))
+        if resolver_class is not None:
+            return resolver_class
+
+        with self.__lock:
+            if (year, day) not in self.__resolvers:
+                self.__resolvers[(year, day)] = self.__import(year, day)
+            return self.__resolvers[(year, day)]
+
+    def create(self, year: int, day: int, **options) -> 'Resolver':
+        resolver_class = self.get(year, day)
+        if options and resolver_class.options_schema is None:
+            raise InvalidResolverOptions(f'Day {day} of {year} does not accept options: {", ".join(options)}')
+
+        try:
+            return resolver_class(**options)
+        except ValidationError as error:
+            raise InvalidResolverOptions(str(error))
+
+    def is_solved(self, year: int, day: int) -> bool:
+        try:
+            self.get(year, day)
+        except ResolverNotFound:
+            return False
+        return True
+
+    def warm_up(self, selection: Iterable[Tuple[int, int]]) -> None:
+        for year, day in selection:
+            self.get(year, day)
+
+    def __import(self, year: int, day: int) -> Type['Resolver']:
+        path = self.__paths.get((year, day), f'y{year}.service.Day{day}Resolver')
+        try:
+            return import_string(path)
+        except ImportError:
+            raise ResolverNotFound(f'Day {day} of {year} is not solved yet')
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> ResolverRegistry:
+    registry = ResolverRegistry()
+    for (year, day), path in getattr(settings, 'RESOLVERS', {}).items():
+        registry.register(year, day, path)
+    return registry
+
+
+def warm_up_resolvers() -> None:
+    get_registry().warm_up(getattr(settings, 'PREWARM_RESOLVERS', []))
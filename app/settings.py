@@ -47,6 +47,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Parses uploads of day routes in worker thread, streaming days are solved while request body is read
+    'app.uploads.streaming_upload_middleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -124,3 +126,57 @@ CACHES = {
         'LOCATION': 'app_cache_table'
     }
 }
+
+# Cache of solutions keyed by uploaded input hash
+# BACKEND is one of `app.cache.LocalMemoryBackend`, `app.cache.DjangoCacheBackend` or `app.cache.FileBackend`
+
+SOLUTIONS_CACHE = {
+    'BACKEND': 'app.cache.LocalMemoryBackend',
+    'TIMEOUT': 60 * 60 * 24,
+    'MAX_ENTRIES': 1024,
+    'OPTIONS': {}
+}
+
+# Executors used to run resolvers, day picks one by its `execution_backend`
+# MAX_QUEUE is amount of jobs allowed to wait for free worker, after that requests are rejected
+# PREFORK starts worker processes together with application instead of on first request
+
+SOLVER_EXECUTORS = {
+    'inline': {
+        'BACKEND': 'app.executors.InlineExecutor',
+    },
+    'thread': {
+        'BACKEND': 'app.executors.ThreadExecutor',
+        'MAX_WORKERS': 4,
+        'MAX_QUEUE': 16,
+        'TIMEOUT': 30,
+    },
+    'process': {
+        'BACKEND': 'app.executors.ProcessExecutor',
+        'MAX_WORKERS': 2,
+        'MAX_QUEUE': 8,
+        'TIMEOUT': 60,
+        'PREFORK': False,
+    },
+}
+
+# Async day endpoints never solve on event loop, days with `inline` executor are moved to OFFLOAD_EXECUTOR
+# Requests above MAX_CONCURRENT are rejected with 429, requests not fitting executor queue with 503
+
+ASYNC_SOLVES = {
+    'MAX_CONCURRENT': 64,
+    'OFFLOAD_EXECUTOR': 'thread',
+}
+
+# Batch requests with more than MAX_ITEMS inputs are rejected with 413, every item takes its own solve slot
+
+BATCH_SOLVES = {
+    'MAX_ITEMS': 100,
+}
+
+# Resolvers are found by convention as `y<year>.service.Day<day>Resolver` and imported on first use
+# RESOLVERS overrides location of single day, PREWARM_RESOLVERS are imported on application start
+
+RESOLVERS = {}
+
+PREWARM_RESOLVERS = []
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import io
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from django.http import JsonResponse
+from django.urls import Resolver404, ResolverMatch, resolve
+from django.utils.decorators import sync_and_async_middleware
+
+from app.executors import TooManySolves, get_solve_limiter
+from app.models import Solution
+
+if TYPE_CHECKING:
+    from y2022.service import Resolver
+
+# Endpoints whose multipart body is parsed before view runs, in worker thread when serving asynchronously
+UPLOAD_ROUTES: Set[str] = set()
+
+# Endpoints solving uploads while they are read, url name to file field and function creating resolver for request.
+# Function returns None when request should not be streamed.
+STREAMING_ROUTES: Dict[str, Tuple[str, Callable[..., Optional['Resolver']]]] = {}
+
+
+def register_upload_route(url_name: str) -> None:
+    UPLOAD_ROUTES.add(url_name)
+
+
+def register_streaming_route(url_name: str, field_name: str,
+                             create_resolver: Callable[..., Optional['Resolver']]) -> None:
+    register_upload_route(url_name)
+    STREAMING_ROUTES[url_name] = (field_name, create_resolver)
+
+
+class StreamedUploadedFile(UploadedFile):
+    """
+    Upload solved by `StreamingSolveUploadHandler` while it was read. Content is not kept, only its size,
+    SHA-256 and line count together with resolver and its solutions.
+    """
+
+    def __init__(self, resolver: 'Resolver', name: str, content_type: str, size: int, charset: Optional[str],
+                 content_type_extra: Optional[dict], digest: str, line_count: int,
+                 solutions: Optional[List[Solution]], error: Optional[Exception]) -> None:
+        super().__init__(io.BytesIO(), name, content_type, size, charset, content_type_extra)
+        self.resolver = resolver
+        self.digest = digest
+        self.line_count = line_count
+        self.solutions = solutions
+        self.error = error
+
+    def get_solutions(self) -> List[Solution]:
+        # Resolver failure is raised where the upload is used, the same as if it was solved there
+        if self.error is not None:
+            raise self.error
+        return self.solutions
+
+
+class StreamingSolveUploadHandler(FileUploadHandler):
+    """
+    Feeds the first file of selected form field to resolver chunk by chunk instead of storing it in memory or
+    temporary file. Other fields and files are left to following handlers.
+    """
+
+    def __init__(self, request, field_name: str, resolver: 'Resolver') -> None:
+        super().__init__(request)
+        self.field_name = field_name
+        self.resolver = resolver
+        self.activated = False
+        self.streamed = False
+        self.digest = hashlib.sha256()
+        self.line_count = 0
+        self.error = None
+
+    def new_file(self, field_name: str, *args, **kwargs) -> None:
+        super().new_file(field_name, *args, **kwargs)
+        self.activated = field_name == self.field_name and not self.streamed
+        if self.activated:
+            raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> Optional[bytes]:
+        if not self.activated:
+            return raw_data
+
+        self.digest.update(raw_data)
+        self.line_count += raw_data.count(b'\n')
+        # Once resolver fails rest of upload is only hashed, error is reported with the upload
+        if self.error is None:
+            try:
+                self.resolver.feed(raw_data)
+            except Exception as error:
+                self.error = error
+        return None
+
+    def file_complete(self, file_size: int) -> Optional[StreamedUploadedFile]:
+        if not self.activated:
+            return None
+
+        self.activated = False
+        self.streamed = True
+        solutions = None
+        if self.error is None:
+            try:
+                solutions = self.resolver.finish()
+            except Exception as error:
+                self.error = error
+        return StreamedUploadedFile(
+            self.resolver, self.file_name, self.content_type, file_size, self.charset, self.content_type_extra,
+            self.digest.hexdigest(), self.line_count, solutions, self.error
+        )
+
+
+def match_upload_route(request) -> Optional[ResolverMatch]:
+    if request.method != 'POST' or request.content_type != 'multipart/form-data':
+        return None
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+    return match if match.url_name in UPLOAD_ROUTES else None
+
+
+def install_streaming_upload_handler(request, match: ResolverMatch) -> bool:
+    if match.url_name not in STREAMING_ROUTES:
+        return False
+
+    field_name, create_resolver = STREAMING_ROUTES[match.url_name]
+    resolver = create_resolver(request, **match.kwargs)
+    if resolver is None:
+        return False
+    request.upload_handlers.insert(0, StreamingSolveUploadHandler(request, field_name, resolver))
+    return True
+
+
+def read_uploads(request, streamed: bool) -> None:
+    # Accessing files parses request body, upload handlers run on the way. Streamed upload is solved right there,
+    # so reading takes solve slot the same way as solving in view does
+    if not streamed:
+        request.FILES
+        return
+    with get_solve_limiter().slot():
+        request.FILES
+
+
+def reject_upload(error: TooManySolves) -> JsonResponse:
+    return JsonResponse({'detail': str(error)}, status=429)
+
+
+@sync_and_async_middleware
+def streaming_upload_middleware(get_response: Callable) -> Callable:
+    """
+    Django parses request body only once view reads form data, which would be too late to choose upload handler
+    and would happen on event loop for async views. Body of upload route is parsed here instead, in worker thread
+    when serving asynchronously, so event loop is blocked neither by parsing, spilling upload to disk nor resolvers.
+    Once all solve slots are taken streamed request is rejected with 429 before body is read.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            match = match_upload_route(request)
+            if match is not None:
+                streamed = install_streaming_upload_handler(request, match)
+                try:
+                    await sync_to_async(read_uploads, thread_sensitive=False)(request, streamed)
+                except TooManySolves as error:
+                    return reject_upload(error)
+            return await get_response(request)
+    else:
+        def middleware(request):
+            match = match_upload_route(request)
+            if match is not None:
+                streamed = install_streaming_upload_handler(request, match)
+                try:
+                    read_uploads(request, streamed)
+                except TooManySolves as error:
+                    return reject_upload(error)
+            return get_response(request)
+    return middleware
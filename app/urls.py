@@ -18,9 +18,11 @@ from django.urls import path
 from django.views.generic import RedirectView
 
 from .api import api
+from .metrics import metrics_view
 
 urlpatterns = [
     path('', RedirectView.as_view(url='api/docs', permanent=True)),
     path('admin/', admin.site.urls),
     path('api/', api.urls),
+    path('metrics', metrics_view),
 ]
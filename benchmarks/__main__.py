@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+
+import django
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks resolvers on generated inputs')
+    parser.add_argument('--year', type=int, default=2022)
+    parser.add_argument('--days', type=int, nargs='+', help='days to run, all generated days by default')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='input size multipliers, 1 is about real puzzle input')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-seconds', type=float, default=30.0,
+                        help='skip larger scales of a day once single run takes longer than this')
+    parser.add_argument('--save', metavar='PATH', help='write results as JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare results with JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown or memory growth against baseline, 0.2 is 20%%')
+    parser.add_argument('--options', metavar='OPTION=VALUE', nargs='+', default=[],
+                        help='resolver options, e.g. mode=treap')
+    parser.add_argument('--differential', metavar='SEEDS', type=int,
+                        help='instead of benchmarking compare engines of days on this many random inputs')
+    arguments = parser.parse_args()
+    options = dict(option.split('=', 1) for option in arguments.options)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    django.setup()
+
+    from benchmarks.harness import find_differences, find_regressions, get_available_days, get_engines, \
+        get_variants, load_baseline, run_benchmark, save_baseline
+
+    days = arguments.days or get_available_days(arguments.year)
+    if arguments.differential:
+        differences = []
+        for day in days:
+            if get_engines(arguments.year, day):
+                seeds = range(arguments.seed, arguments.seed + arguments.differential)
+                day_differences = find_differences(arguments.year, day, seeds)
+                print(f'{arguments.year}/{day}: {len(day_differences)} differences in {arguments.differential} seeds')
+                differences.extend(day_differences)
+        for difference in differences:
+            print(f'DIFFERENCE {difference}')
+        return 1 if differences else 0
+
+    results = []
+    print(f'{"benchmark":<28}{"input":>12}{"best, s":>12}{"mean, s":>12}{"peak memory":>14}{"MB/s":>10}')
+    for day in days:
+        for variant in get_variants(arguments.year, day):
+            for scale in sorted(arguments.scales):
+                result = run_benchmark(arguments.year, day, scale, arguments.seed, arguments.repeat, variant,
+                                       options)
+                results.append(result)
+                throughput = (result['throughput_bytes_per_second'] or 0) / 1e6
+                print(f'{result["key"]:<28}{result["input_bytes"]:>12}{result["best_seconds"]:>12.4f}'
+                      f'{result["mean_seconds"]:>12.4f}{result["peak_memory_bytes"]:>14}{throughput:>10.2f}',
+                      flush=True)
+                if result['best_seconds'] > arguments.max_seconds:
+                    print(f'{result["key"]}: skipping larger scales, run took over {arguments.max_seconds}s')
+                    break
+
+    if arguments.save:
+        save_baseline(arguments.save, results)
+
+    if arguments.compare:
+        regressions = find_regressions(results, load_baseline(arguments.compare), arguments.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
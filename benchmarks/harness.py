@@ -0,0 +1,130 @@
+import gc
+import json
+import time
+import tracemalloc
+from importlib import import_module
+from random import Random
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from app.registry import get_registry
+
+
+def get_generator(year: int, day: int, variant: Optional[str] = None) -> Callable[[Random, int], bytes]:
+    generators = import_module(f'benchmarks.y{year}')
+    if variant is None:
+        return generators.GENERATORS[day]
+    return generators.VARIANTS[day][variant]
+
+
+def get_available_days(year: int) -> List[int]:
+    return sorted(import_module(f'benchmarks.y{year}').GENERATORS)
+
+
+def get_engines(year: int, day: int) -> List[dict]:
+    return getattr(import_module(f'benchmarks.y{year}'), 'ENGINES', {}).get(day, [])
+
+
+def get_variants(year: int, day: int) -> List[Optional[str]]:
+    # `None` stands for regular input of the day
+    return [None] + sorted(getattr(import_module(f'benchmarks.y{year}'), 'VARIANTS', {}).get(day, {}))
+
+
+def generate_input(year: int, day: int, scale: int, seed: int, variant: Optional[str] = None) -> bytes:
+    name = f'{day}-{variant}' if variant else f'{day}'
+    return get_generator(year, day, variant)(Random(f'{year}/{name}/{seed}'), scale)
+
+
+def get_key(year: int, day: int, scale: int, variant: Optional[str] = None, options: Optional[dict] = None) -> str:
+    name = f'{day}-{variant}' if variant else f'{day}'
+    key = f'{year}/{name}/x{scale}'
+    if options:
+        key += '[' + ','.join(f'{option}={value}' for option, value in sorted(options.items())) + ']'
+    return key
+
+
+def solve(year: int, day: int, problem_input: bytes, options: Optional[dict] = None) -> List[dict]:
+    resolver = get_registry().create(year, day, **(options or {}))
+    return [solution.dict() for solution in resolver.resolve(SimpleUploadedFile('problem_input', problem_input))]
+
+
+def find_differences(year: int, day: int, seeds: Iterable[int], scale: int = 1) -> List[str]:
+    # Every engine of the day solves the same random inputs of all variants, first engine is the reference
+    engines = get_engines(year, day)
+    differences = []
+    for seed in seeds:
+        for variant in get_variants(year, day):
+            problem_input = generate_input(year, day, scale, seed, variant)
+            expected = solve(year, day, problem_input, engines[0])
+            for options in engines[1:]:
+                solutions = solve(year, day, problem_input, options)
+                if solutions != expected:
+                    differences.append(f'{get_key(year, day, scale, variant, options)} seed {seed}: '
+                                       f'{solutions} instead of {expected}')
+    return differences
+
+
+def run_benchmark(year: int, day: int, scale: int, seed: int = 0, repeat: int = 3,
+                  variant: Optional[str] = None, options: Optional[dict] = None) -> dict:
+    problem_input = generate_input(year, day, scale, seed, variant)
+    resolver = get_registry().create(year, day, **(options or {}))
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        resolver.resolve(SimpleUploadedFile('problem_input', problem_input))
+        timings.append(time.perf_counter() - started)
+
+    # Tracing slows everything down, so memory is measured in separate run
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resolver.resolve(SimpleUploadedFile('problem_input', problem_input))
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        'key': get_key(year, day, scale, variant, options),
+        'year': year,
+        'day': day,
+        'variant': variant,
+        'options': options,
+        'scale': scale,
+        'seed': seed,
+        'input_bytes': len(problem_input),
+        'input_lines': problem_input.count(b'\n'),
+        'best_seconds': best,
+        'mean_seconds': sum(timings) / len(timings),
+        'peak_memory_bytes': peak_memory,
+        'throughput_bytes_per_second': len(problem_input) / best if best else None,
+    }
+
+
+def save_baseline(path: str, results: List[dict]) -> None:
+    with open(path, 'w') as baseline_file:
+        json.dump({'results': results}, baseline_file, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    with open(path) as baseline_file:
+        return {result['key']: result for result in json.load(baseline_file)['results']}
+
+
+def find_regressions(results: List[dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['key'])
+        if previous is None:
+            continue
+
+        for metric in ('best_seconds', 'peak_memory_bytes'):
+            if result[metric] > previous[metric] * (1 + threshold):
+                change = result[metric] / previous[metric] - 1 if previous[metric] else float('inf')
+                regressions.append(
+                    f'{result["key"]}: {metric} {previous[metric]:.6g} -> {result[metric]:.6g} (+{change:.0%})'
+                )
+    return regressions
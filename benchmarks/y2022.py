@@ -0,0 +1,266 @@
+import math
+import string
+from random import Random
+
+# Generators produce valid puzzle inputs for each day. `scale` 1 is close to real puzzle input size,
+# larger scale grows input roughly linearly in bytes.
+
+
+def generate_day1(rng: Random, scale: int) -> bytes:
+    lines = []
+    for _ in range(250 * scale):
+        for _ in range(rng.randint(1, 15)):
+            lines.append(str(rng.randint(1000, 60000)))
+        lines.append('')
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day2(rng: Random, scale: int) -> bytes:
+    rounds = [f'{rng.choice("ABC")} {rng.choice("XYZ")}' for _ in range(2500 * scale)]
+    return '\n'.join(rounds).encode() + b'\n'
+
+
+def generate_day3(rng: Random, scale: int) -> bytes:
+    lines = []
+    for _ in range(100 * scale):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, pools = letters[0], [letters[1 + idx * 17:1 + (idx + 1) * 17] for idx in range(3)]
+
+        # Every elf has own letters, so badge is the only item common to the whole group
+        for pool in pools:
+            shared_item, first_letters, second_letters = pool[0], pool[1:9], pool[9:17]
+            half_size = rng.randint(6, 24)
+            first = [rng.choice(first_letters) for _ in range(half_size - 1)] + [shared_item]
+            second = [rng.choice(second_letters) for _ in range(half_size - 2)] + [shared_item, badge]
+            rng.shuffle(first)
+            rng.shuffle(second)
+            lines.append(''.join(first) + ''.join(second))
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day4(rng: Random, scale: int) -> bytes:
+    lines = []
+    for _ in range(1000 * scale):
+        first_start, second_start = rng.randint(1, 99), rng.randint(1, 99)
+        first_end, second_end = rng.randint(first_start, 99), rng.randint(second_start, 99)
+        lines.append(f'{first_start}-{first_end},{second_start}-{second_end}')
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day5(rng: Random, scale: int) -> bytes:
+    # Input format only allows single digit stack numbers
+    stack_count = 9
+    stacks = [[rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 8 * scale))]
+              for _ in range(stack_count)]
+    heights = [len(stack) for stack in stacks]
+
+    lines = []
+    for row in range(max(heights), 0, -1):
+        cells = [f'[{stack[row - 1]}]' if len(stack) >= row else '   ' for stack in stacks]
+        lines.append(' '.join(cells))
+    lines.append(' '.join(f' {idx} ' for idx in range(1, stack_count + 1)))
+    lines.append('')
+
+    for _ in range(500 * scale):
+        # Keep at least one crate on every stack, so top crates are always defined
+        from_stack = rng.choice([idx for idx, height in enumerate(heights) if height > 1])
+        to_stack = rng.choice([idx for idx in range(stack_count) if idx != from_stack])
+        crates = rng.randint(1, min(heights[from_stack] - 1, 30))
+        heights[from_stack] -= crates
+        heights[to_stack] += crates
+        lines.append(f'move {crates} from {from_stack + 1} to {to_stack + 1}')
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day5_tall(rng: Random, scale: int) -> bytes:
+    # Tall stacks and large moves which may empty whole stack
+    stack_count = 9
+    heights = [rng.randint(500 * scale, 1500 * scale) for _ in range(stack_count)]
+
+    lines = []
+    for row in range(max(heights), 0, -1):
+        lines.append(' '.join(f'[{rng.choice(string.ascii_uppercase)}]' if height >= row else '   '
+                              for height in heights))
+    lines.append(' '.join(f' {idx} ' for idx in range(1, stack_count + 1)))
+    lines.append('')
+
+    for _ in range(1000 * scale):
+        from_stack = rng.choice([idx for idx, height in enumerate(heights) if height > 0])
+        to_stack = rng.choice([idx for idx in range(stack_count) if idx != from_stack])
+        crates = rng.randint(1, heights[from_stack])
+        heights[from_stack] -= crates
+        heights[to_stack] += crates
+        lines.append(f'move {crates} from {from_stack + 1} to {to_stack + 1}')
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day6(rng: Random, scale: int) -> bytes:
+    # Three letter alphabet can not contain any marker, so both markers are found at the very end
+    prefix = ''.join(rng.choice('abc') for _ in range(4096 * scale))
+    marker = ''.join(rng.sample(string.ascii_lowercase[3:], 14))
+    return (prefix + marker).encode() + b'\n'
+
+
+def generate_day7(rng: Random, scale: int) -> bytes:
+    file_count = 500 * scale
+    # Around 45M of 70M is used, so part two always has to free some space
+    max_file_size = 2 * 45000000 // file_count
+
+    lines = ['$ cd /']
+    directories = 0
+
+    def list_directory(depth: int) -> []:
+        nonlocal directories, file_count
+        subdirectories = []
+        entries = []
+        for _ in range(rng.randint(1, 8)):
+            if file_count <= 0:
+                break
+            file_count -= 1
+            entries.append(f'{rng.randint(1, max_file_size)} {rng.choice(string.ascii_lowercase)}{file_count}.dat')
+
+        directory_count = 5 if depth == 0 else rng.randint(0, 3)
+        for _ in range(directory_count):
+            directories += 1
+            name = f'd{directories}'
+            subdirectories.append(name)
+            entries.append(f'dir {name}')
+
+        rng.shuffle(entries)
+        lines.append('$ ls')
+        lines.extend(entries)
+        return subdirectories
+
+    # Depth first walk with explicit stack, generated trees get deeper than recursion limit on larger scales
+    while file_count > 0:
+        walk = [(0, iter(list_directory(0)))]
+        while walk:
+            depth, subdirectories = walk[-1]
+            name = next(subdirectories, None)
+            if name is None or (file_count <= 0 and depth > 0):
+                walk.pop()
+                if walk:
+                    lines.append('$ cd ..')
+                continue
+
+            lines.append(f'$ cd {name}')
+            walk.append((depth + 1, iter(list_directory(depth + 1))))
+        lines.append('$ cd /')
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day7_deep(rng: Random, scale: int) -> bytes:
+    depth = 1000 * scale
+    max_file_size = 2 * 45000000 // depth
+
+    lines = ['$ cd /']
+    for level in range(depth):
+        lines.extend(['$ ls', f'{rng.randint(1, max_file_size)} f{level}.dat', f'dir d{level}', f'$ cd d{level}'])
+
+    # Climb half way up and walk down again, revisited directories are listed once more
+    lines.extend(['$ cd ..'] * (depth // 2))
+    for level in range(depth - depth // 2, depth):
+        lines.extend([f'$ cd d{level}', '$ ls', f'dir d{level + 1}'])
+    lines.append('$ cd /')
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day7_wide(rng: Random, scale: int) -> bytes:
+    directory_count = 2000 * scale
+    # No single directory is big, so around 30M of 70M is used to leave enough space for update
+    max_file_size = 2 * 30000000 // (directory_count * 3)
+
+    lines = ['$ cd /', '$ ls'] + [f'dir d{idx}' for idx in range(directory_count)]
+    listings = []
+    for idx in range(directory_count):
+        listing = [f'{rng.randint(1, max_file_size)} f{file_idx}.dat' for file_idx in range(rng.randint(1, 5))]
+        listings.append(listing)
+        lines.extend([f'$ cd d{idx}', '$ ls', *listing, '$ cd ..'])
+
+    # Revisit random directories, their listings repeat already known files
+    for _ in range(directory_count // 10):
+        idx = rng.randrange(directory_count)
+        lines.extend([f'$ cd d{idx}', '$ ls', *listings[idx], '$ cd /'])
+    return '\n'.join(lines).encode() + b'\n'
+
+
+def generate_day8(rng: Random, scale: int) -> bytes:
+    size = round(99 * math.sqrt(scale))
+    return '\n'.join(''.join(rng.choice(string.digits) for _ in range(size)) for _ in range(size)).encode() + b'\n'
+
+
+def generate_day9(rng: Random, scale: int) -> bytes:
+    motions = [f'{rng.choice("URDL")} {rng.randint(1, 20)}' for _ in range(2000 * scale)]
+    return '\n'.join(motions).encode() + b'\n'
+
+
+def generate_day10(rng: Random, scale: int) -> bytes:
+    # Register has to stay within screen, otherwise picture is empty
+    instructions = []
+    register = 1
+    for _ in range(140 * scale):
+        if rng.random() < 0.3:
+            instructions.append('noop')
+        else:
+            increase = rng.randint(-10, 10)
+            if not 0 <= register + increase <= 39:
+                increase = -increase
+            register += increase
+            instructions.append(f'addx {increase}')
+    return '\n'.join(instructions).encode() + b'\n'
+
+
+def generate_day11(rng: Random, scale: int) -> bytes:
+    divisors = [2, 3, 5, 7, 11, 13, 17, 19]
+    rng.shuffle(divisors)
+    monkey_count = len(divisors)
+
+    # Part one keeps worry levels unbounded, so exactly one monkey squares them as in real puzzle inputs
+    squaring_monkey = rng.randrange(monkey_count)
+    blocks = []
+    for idx, divisor in enumerate(divisors):
+        items = ', '.join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8) * scale))
+        if idx == squaring_monkey:
+            operation = 'old * old'
+        else:
+            operation = rng.choice([f'old * {rng.randint(2, 19)}', f'old + {rng.randint(1, 8)}'])
+        targets = rng.sample([target for target in range(monkey_count) if target != idx], 2)
+        blocks.append(f'''Monkey {idx}:
+  Starting items: {items}
+  Operation: new = {operation}
+  Test: divisible by {divisor}
+    If true: throw to monkey {targets[0]}
+    If false: throw to monkey {targets[1]}''')
+    return '\n\n'.join(blocks).encode() + b'\n'
+
+
+GENERATORS = {
+    1: generate_day1,
+    2: generate_day2,
+    3: generate_day3,
+    4: generate_day4,
+    5: generate_day5,
+    6: generate_day6,
+    7: generate_day7,
+    8: generate_day8,
+    9: generate_day9,
+    10: generate_day10,
+    11: generate_day11,
+}
+
+# Additional inputs of the same day stressing particular shape of input
+VARIANTS = {
+    5: {
+        'tall': generate_day5_tall,
+    },
+    7: {
+        'deep': generate_day7_deep,
+        'wide': generate_day7_wide,
+    },
+}
+
+# Option sets of days with more than one engine, all of them have to give the same solutions
+ENGINES = {
+    5: [{'mode': 'list'}, {'mode': 'treap'}],
+}
@@ -1,15 +1,21 @@
+import heapq
 from enum import Enum
-from typing import List
+from functools import partial
+from typing import List, Optional, Union
 
-from ninja import Router, File
+from ninja import Router, File, Query
 from ninja.files import UploadedFile
 
-from y2022.models import Solution
-from y2022.service import Day1Resolver, Day2Resolver, Day3Resolver, Day4Resolver, Day5Resolver, Day6Resolver, \
-    Day7Resolver, Day8Resolver, Day9Resolver, Day10Resolver, Day11Resolver
+from app.dispatch import create_streaming_resolver, report_async, solve_batch_async, solve_day_async
+from app.models import BatchItemResult, ProfiledSolutions, Solution
+from app.registry import get_registry
+from app.uploads import register_streaming_route, register_upload_route
+from y2022.models import DirectorySize, KnotVisits
 
 router = Router(tags=["2022"])
 
+YEAR = 2022
+
 
 class DaySelection(str, Enum):
     DAY_1 = '1',
@@ -39,100 +45,90 @@ class DaySelection(str, Enum):
     DAY_25 = '25',
 
 
-@router.post('/day/1', response=List[Solution], summary='Day 1 solutions')
-def day1_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 1 problem and provides solution for both parts
-    """
-    resolver = Day1Resolver()
-    return list(resolver.resolve(problem_input))
+def report_directory_sizes(problem_input: UploadedFile, max_size: Optional[int], limit: int) -> List[dict]:
+    resolver = get_registry().create(YEAR, 7)
+    directories = resolver.parse(problem_input).get_directories()
+    if max_size is not None:
+        directories = (directory for directory in directories if directory.get_size() <= max_size)
+    # Transcript may contain millions of directories, paths are only built for the reported ones
+    return [{'path': directory.get_path(), 'size': directory.get_size()}
+            for directory in heapq.nlargest(limit, directories, key=lambda directory: directory.get_size())]
 
 
-@router.post('/day/2', response=List[Solution], summary='Day 2 solutions')
-def day2_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 2 problem and provides solution for both parts
-    """
-    resolver = Day2Resolver()
-    return list(resolver.resolve(problem_input))
+def report_knot_visits(problem_input: UploadedFile, knots: List[int]) -> List[dict]:
+    resolver = get_registry().create(YEAR, 9, knots=knots)
+    return [{'knot': knot, 'unique_visits': visits} for knot, visits in resolver.parse(problem_input).items()]
 
 
-@router.post('/day/3', response=List[Solution], summary='Day 3 solutions')
-def day3_solution(request, problem_input: UploadedFile = File(...)):
+@router.post('/day/{day}', response=Union[List[Solution], ProfiledSolutions], summary='Day solutions',
+             url_name=f'day_solution_{YEAR}')
+async def day_solution(request, day: DaySelection, problem_input: UploadedFile = File(...), profile: bool = False):
     """
-    Solves Day 3 problem and provides solution for both parts
-    """
-    resolver = Day3Resolver()
-    return list(resolver.resolve(problem_input))
+    Solves selected day problem and provides solution for both parts
 
+    With `profile=1` solutions come together with per stage timings and `cProfile` summary of resolver run.
 
-@router.post('/day/4', response=List[Solution], summary='Day 4 solutions')
-def day4_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 4 problem and provides solution for both parts
+    Other query parameters are options of selected day, unknown or invalid ones are rejected with 422:
+    - day 1: `top` elves summed in part two (default 3)
+    - day 3: `group_size` of elf groups (default 3)
+    - day 5: `mode` of crane engine, `list` (default) or `treap` for very tall stacks
+    - day 6: `packet_marker_length` (default 4) and `message_marker_length` (default 14)
+    - day 9: `knots` whose unique positions are counted, e.g. `knots=1,9`; part one is the first, part two the last
+    - day 10: `cycles` whose signal strengths are summed in part one, e.g. `cycles=20,60`
+    - day 11: `rounds` of part two (default 10000)
+
+    Days 1, 2, 3, 4, 6 and 10 are solved while the upload is still being read, before cached solutions are looked
+    up, so repeated upload of these days is solved again.
     """
-    resolver = Day4Resolver()
-    return list(resolver.resolve(problem_input))
+    return await solve_day_async(YEAR, int(day.value), request, problem_input, profile)
 
 
-@router.post('/day/5', response=List[Solution], summary='Day 5 solutions')
-def day5_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 5 problem and provides solution for both parts
-    """
-    resolver = Day5Resolver()
-    return list(resolver.resolve(problem_input))
+register_streaming_route(f'day_solution_{YEAR}', 'problem_input', partial(create_streaming_resolver, YEAR))
 
 
-@router.post('/day/6', response=List[Solution], summary='Day 6 solutions')
-def day6_solution(request, problem_input: UploadedFile = File(...)):
+@router.post('/day/7/directories', response=List[DirectorySize], summary='Day 7 directory sizes',
+             url_name=f'day_7_directory_sizes_{YEAR}')
+async def day_7_directory_sizes(request, problem_input: UploadedFile = File(...), max_size: Optional[int] = None,
+                                limit: int = Query(100, ge=1, le=100000)):
     """
-    Solves Day 6 problem and provides solution for both parts
+    Reports total sizes of directories from shell transcript of day 7, largest first
+
+    Use `max_size` to report only directories of at most that size and `limit` to cap number of reported directories.
     """
-    resolver = Day6Resolver()
-    return list(resolver.resolve(problem_input))
+    return await report_async(YEAR, 7, report_directory_sizes, problem_input, max_size, limit)
 
 
-@router.post('/day/7', response=List[Solution], summary='Day 7 solutions')
-def day7_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 7 problem and provides solution for both parts
-    """
-    resolver = Day7Resolver()
-    return list(resolver.resolve(problem_input))
+register_upload_route(f'day_7_directory_sizes_{YEAR}')
 
 
-@router.post('/day/8', response=List[Solution], summary='Day 8 solutions')
-def day8_solution(request, problem_input: UploadedFile = File(...)):
+@router.post('/day/9/visits', response=List[KnotVisits], summary='Day 9 rope knot visits',
+             url_name=f'day_9_knot_visits_{YEAR}')
+async def day_9_knot_visits(request, problem_input: UploadedFile = File(...), knots: List[int] = Query([1, 9])):
     """
-    Solves Day 8 problem and provides solution for both parts
+    Counts unique positions of any knots of the rope from day 9 in one simulation of the longest rope
+
+    Knot `k` is the tail of rope with `k` knots behind the head, e.g. `knots=1&knots=5&knots=9`.
     """
-    resolver = Day8Resolver()
-    return list(resolver.resolve(problem_input))
+    return await report_async(YEAR, 9, report_knot_visits, problem_input, knots)
 
 
-@router.post('/day/9', response=List[Solution], summary='Day 9 solutions')
-def day9_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 9 problem and provides solution for both parts
-    """
-    resolver = Day9Resolver()
-    return list(resolver.resolve(problem_input))
+register_upload_route(f'day_9_knot_visits_{YEAR}')
 
 
-@router.post('/day/10', response=List[Solution], summary='Day 10 solutions')
-def day10_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 10 problem and provides solution for both parts
+@router.post('/batch', response=List[BatchItemResult], summary='Batch solutions')
+async def batch_solution(request, stream: bool = False):
     """
-    resolver = Day10Resolver()
-    return list(resolver.resolve(problem_input))
+    Solves many inputs for many days in one request. Results keep order of inputs and failed item does not fail
+    whole batch.
 
+    Accepts either `multipart/form-data` with repeated `days` and `problem_inputs` fields or
+    `application/x-ndjson` body with one `{"day": 1, "input": "..."}` object per line. NDJSON items may carry
+    day options too, e.g. `{"day": 11, "input": "...", "options": {"rounds": 20}}`.
 
-@router.post('/day/11', response=List[Solution], summary='Day 11 solutions')
-def day11_solution(request, problem_input: UploadedFile = File(...)):
-    """
-    Solves Day 11 problem and provides solution for both parts
+    With `stream=true` each result is sent as soon as it is ready as `application/x-ndjson` line (with Django 4.2 and
+    later, older one sends lines once whole batch is solved).
+
+    Batch of more than `BATCH_SOLVES.MAX_ITEMS` items is rejected with 413. Item over the limit of concurrent solves
+    fails with `HttpError` like any other failed item.
     """
-    resolver = Day11Resolver()
-    return list(resolver.resolve(problem_input))
+    return await solve_batch_async(YEAR, request, stream)
@@ -1,15 +1,69 @@
-from enum import Enum
-from typing import Union
+from typing import List, Literal
 
 from ninja import Schema
+from pydantic import Field, validator
+
+from app.models import ResolverOptions, split_comma_separated
 
 
 # Create your models here.
-class Part(Enum):
-    ONE = 1
-    TWO = 2
+class DirectorySize(Schema):
+    path: str
+    size: int
+
+
+class KnotVisits(Schema):
+    knot: int
+    unique_visits: int
+
+
+class Day1Options(ResolverOptions):
+    # Elves carrying the most calories summed in part two
+    top: int = Field(3, ge=1, le=10000)
+
+
+class Day3Options(ResolverOptions):
+    # Elves sharing one badge
+    group_size: int = Field(3, ge=1, le=10000)
+
+
+class Day5Options(ResolverOptions):
+    # `list` moves crates by slicing, `treap` splits and joins stacks in logarithmic time for huge stacks
+    mode: Literal['list', 'treap'] = 'list'
+
+
+class Day6Options(ResolverOptions):
+    # Marker is made of distinct bytes, so no longer marker can exist
+    packet_marker_length: int = Field(4, ge=1, le=256)
+    message_marker_length: int = Field(14, ge=1, le=256)
+
+
+class Day9Options(ResolverOptions):
+    # Knots whose unique positions are counted, part one answers the first one and part two the last one
+    knots: List[int] = Field([1, 9], min_items=1, max_items=100)
+
+    _split_knots = validator('knots', pre=True, allow_reuse=True)(split_comma_separated)
+
+    @validator('knots', each_item=True)
+    def check_knot(cls, knot):
+        if not 1 <= knot <= 10000:
+            raise ValueError('knot has to be between 1 and 10000')
+        return knot
+
+
+class Day10Options(ResolverOptions):
+    # Cycles whose signal strengths are summed in part one
+    cycles: List[int] = Field([20, 60, 100, 140, 180, 220], min_items=1, max_items=10000)
+
+    _split_cycles = validator('cycles', pre=True, allow_reuse=True)(split_comma_separated)
+
+    @validator('cycles', each_item=True)
+    def check_cycle(cls, cycle):
+        if cycle < 1:
+            raise ValueError('cycles start with 1')
+        return cycle
 
 
-class Solution(Schema):
-    part: int
-    result: Union[int, str]
+class Day11Options(ResolverOptions):
+    # Rounds of part two, first part always plays 20
+    rounds: int = Field(10000, ge=1, le=10 ** 12)
@@ -0,0 +1,137 @@
+import io
+import mmap
+import re
+from typing import Generator, Union
+
+from ninja import UploadedFile
+
+
+class ByteGrid:
+
+    def __init__(self, cells: bytes, width: int, height: int, row_stride: int) -> None:
+        # Rows follow each other `row_stride` bytes apart, line endings between them are left in place
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.row_stride = row_stride
+
+    def get_rows(self) -> Generator:
+        for row_idx in range(self.height):
+            yield self.cells[row_idx * self.row_stride:row_idx * self.row_stride + self.width]
+
+    def get_columns(self) -> Generator:
+        for col_idx in range(self.width):
+            yield self.cells[col_idx:(self.height - 1) * self.row_stride + col_idx + 1:self.row_stride]
+
+
+class InputReader:
+    """
+    Byte level access to uploaded input without decoding it.
+
+    Upload kept in memory is read through `memoryview` of its buffer, upload spilled to disk is mapped with `mmap`,
+    so lines and integers are scanned from blocks of complete lines without copying the input as a whole.
+    Only `grid` copies the input once, its cells outlive the upload (e.g. are pickled for process workers).
+    """
+
+    BLOCK_SIZE = 1024 * 1024
+    LINE_END_PATTERN = re.compile(rb'\n')
+    LINE_CONTENT_PATTERN = re.compile(rb'[^\r\n]*')
+    WHITESPACE = b' \t\r\n\x0b\x0c'
+    UNSIGNED_INTEGER_PATTERN = re.compile(rb'\d+')
+    INTEGER_PATTERN = re.compile(rb'-?\d+')
+
+    def __init__(self, problem_input: UploadedFile) -> None:
+        self.__mapped_file = None
+        self.__mapping = None
+        # Block readers left suspended (e.g. when parsing fails) still hold views, they are closed with input
+        self.__block_readers = []
+        self.view = self.__open(problem_input)
+
+    def __enter__(self) -> 'InputReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for block_reader in self.__block_readers:
+            block_reader.close()
+        self.view.release()
+        if self.__mapping is not None:
+            self.__mapping.close()
+        if self.__mapped_file is not None:
+            self.__mapped_file.close()
+
+    def blocks(self, block_size: int = BLOCK_SIZE) -> Generator:
+        # Views of consecutive parts of input, every one of them ends with complete line
+        block_reader = self.__read_blocks(block_size)
+        self.__block_readers.append(block_reader)
+        return block_reader
+
+    def slices(self, slice_size: int = BLOCK_SIZE) -> Generator:
+        # Views of consecutive parts of input of the same size, regardless of lines
+        block_reader = self.__read_slices(slice_size)
+        self.__block_readers.append(block_reader)
+        return block_reader
+
+    def lines(self) -> Generator:
+        # Lines without line endings, blank ones included
+        for block in self.blocks():
+            yield from bytes(block).splitlines()
+
+    def integers(self, signed: bool = True) -> Generator:
+        # Minus sign is only taken as part of number when it is signed, e.g. `2-4` are two unsigned numbers
+        pattern = self.INTEGER_PATTERN if signed else self.UNSIGNED_INTEGER_PATTERN
+        for block in self.blocks():
+            yield from map(int, pattern.findall(block))
+
+    def grid(self) -> ByteGrid:
+        # Rows have to be of the same length, so cells are addressed by row stride without splitting input into lines
+        width = self.LINE_CONTENT_PATTERN.match(self.view).end()
+        line_end = b'\r\n' if self.view[width:width + 2] == b'\r\n' else b'\n'
+        row_stride = width + len(line_end)
+
+        # Trailing whitespace is left out before copying, so input is copied exactly once
+        content_end = len(self.view)
+        while content_end and self.view[content_end - 1] in self.WHITESPACE:
+            content_end -= 1
+        with self.view[:content_end] as content:
+            cells = bytes(content)
+        height, remainder = divmod(len(cells) + len(line_end), row_stride)
+        if not width or remainder or cells.count(b'\n') != height - 1:
+            raise RuntimeError('Invalid grid format!')
+        for offset, line_end_byte in enumerate(line_end):
+            if cells[width + offset::row_stride].count(line_end_byte) != height - 1:
+                raise RuntimeError('Invalid grid format!')
+        return ByteGrid(cells, width, height, row_stride)
+
+    def __read_blocks(self, block_size: int) -> Generator:
+        position = 0
+        while position < len(self.view):
+            line_end = self.LINE_END_PATTERN.search(self.view, min(position + block_size, len(self.view)) - 1)
+            block_end = line_end.end() if line_end else len(self.view)
+            # Block is released once consumer moves on, mapped file cannot be closed while any view is left
+            with self.view[position:block_end] as block:
+                yield block
+            position = block_end
+
+    def __read_slices(self, slice_size: int) -> Generator:
+        for position in range(0, len(self.view), slice_size):
+            with self.view[position:position + slice_size] as block:
+                yield block
+
+    def __open(self, problem_input: UploadedFile) -> memoryview:
+        if hasattr(problem_input, 'temporary_file_path'):
+            self.__mapped_file = open(problem_input.temporary_file_path(), 'rb')
+            if problem_input.size:
+                self.__mapping = mmap.mmap(self.__mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+                return memoryview(self.__mapping)
+            return memoryview(b'')
+
+        if isinstance(problem_input.file, io.BytesIO):
+            return problem_input.file.getbuffer()
+
+        problem_input.seek(0)
+        content: Union[bytes, str] = problem_input.read()
+        problem_input.seek(0)
+        return memoryview(content.encode() if isinstance(content, str) else content)
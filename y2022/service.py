@@ -1,390 +1,661 @@
+import bisect
+import copy
+import heapq
 import math
+import operator
+import random
 import re
 import string
+import time
 from abc import abstractmethod
+from array import array
 from enum import Enum
-from functools import reduce
-from typing import List, Union, Generator
+from functools import partial
+from itertools import chain
+from typing import Any, Callable, Iterator, List, Union, Generator
 
 from ninja import UploadedFile
 
-from y2022.models import Part, Solution
+from app.models import Part, Solution
+from y2022.models import Day1Options, Day3Options, Day5Options, Day6Options, Day9Options, Day10Options, \
+    Day11Options
+from y2022.reader import ByteGrid, InputReader
 
 
-class Resolver:
+class StreamParser:
+    # Input is pushed in blocks as it is read, every block ends with complete line unless `line_aligned` is off.
+    # Last block may miss its line break.
+    line_aligned = True
+    # Size of blocks when whole input is at hand, see `Resolver.parse_stream`
+    block_size = InputReader.BLOCK_SIZE
+    # Set once parser needs no more input, rest of input is not read
+    done = False
+    # Inputs of one record per line count both, see `count_records`
+    record_count = 0
+    line_count = 0
+
     @abstractmethod
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
+    def feed(self, block: bytes) -> None:
         pass
 
+    @abstractmethod
+    def finish(self) -> Any:
+        pass
+
+    def count_records(self, block: bytes, record_count: int) -> None:
+        self.record_count += record_count
+        # Last line of input may come without line break, trailing whitespace is not a line
+        self.line_count += block.count(b'\n') + bool(block[block.rfind(b'\n') + 1:].strip())
+
+    def check_records(self, error: str) -> None:
+        # Line holding no record or more of them would otherwise go unnoticed
+        if self.record_count != self.line_count:
+            raise RuntimeError(error)
+
+
+class Resolver:
+    # Bump whenever day output for the same input may change, it invalidates cached results
+    version = 1
+    # Name of executor from `SOLVER_EXECUTORS` setting, CPU heavy days should go to `process`
+    execution_backend = 'inline'
+    # Solve part one and part two as separate jobs, so they can run on different workers
+    parallel_parts = False
+    # Parse input with `create_stream_parser`, so upload can be solved with `feed` and `finish` while it arrives
+    streaming = False
+    # Schema of day specific options, they come from request query parameters
+    options_schema = None
+
+    def __init__(self, **options) -> None:
+        # Seconds spent per stage (`parse`, `part_one`, `part_two`) during last resolve
+        self.timings = {}
+        self.options = self.options_schema(**options) if self.options_schema else None
+        self.__stream_parser = None
+        self.__incomplete_line = bytearray()
+
+    def get_options(self) -> dict:
+        return self.options.dict() if self.options else {}
 
-class Day1Resolver(Resolver):
     def resolve(self, problem_input: UploadedFile) -> List[Solution]:
+        parsed_input = self.measure('parse', self.parse, problem_input)
+        return self.solve(parsed_input)
+
+    def solve(self, parsed_input: Any) -> List[Solution]:
+        part_two_input = self.copy_parsed_input(parsed_input)
         return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input))
+            self.solve_part(Part.ONE, parsed_input),
+            self.solve_part(Part.TWO, part_two_input),
         ]
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        elfs = self.__get_each_elf_calories(problem_input)
-        return max(elfs)
-
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        elfs = self.__get_each_elf_calories(problem_input)
-        elfs.sort(reverse=True)
-        return sum(elfs[0:3])
-
-    def __get_each_elf_calories(self, problem_input: UploadedFile) -> []:
-        elfs = []
-        current_elf_cal = 0
-        for line in problem_input:
-            decoded_line = line.decode()
-            if decoded_line.strip() == '':
-                elfs.append(current_elf_cal)
-                current_elf_cal = 0
+    def solve_part(self, part: Part, parsed_input: Any) -> Solution:
+        solver = self.solve_part_one if part == Part.ONE else self.solve_part_two
+        return Solution(part=part.value, result=self.measure(f'part_{part.name.lower()}', solver, parsed_input))
+
+    def measure(self, stage: str, fn: Callable, *args) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.timings[stage] = time.perf_counter() - started
+
+    def feed(self, chunk: bytes) -> None:
+        # Next chunk of upload, parsing time of all chunks adds up
+        started = time.perf_counter()
+        if self.__stream_parser is None:
+            self.__stream_parser = self.create_stream_parser()
+
+        if self.__stream_parser.line_aligned:
+            # Line cut by chunk end waits for the rest of it. Only new chunk is searched for line end and pending
+            # part is appended in place, so line spanning many chunks is not copied over and over
+            block_end = chunk.rfind(b'\n') + 1
+            if not block_end:
+                self.__incomplete_line += chunk
+                chunk = b''
             else:
-                current_elf_cal += int(decoded_line.strip())
-        return elfs
+                self.__incomplete_line += chunk[:block_end]
+                chunk, self.__incomplete_line = self.__incomplete_line, bytearray(chunk[block_end:])
+        if chunk and not self.__stream_parser.done:
+            self.__stream_parser.feed(chunk)
+        self.timings['parse'] = self.timings.get('parse', 0.0) + time.perf_counter() - started
+
+    def finish(self) -> List[Solution]:
+        # Upload is complete, solutions are found the same way as by `resolve`
+        started = time.perf_counter()
+        stream_parser = self.__stream_parser or self.create_stream_parser()
+        if self.__incomplete_line:
+            stream_parser.feed(self.__incomplete_line)
+        parsed_input = stream_parser.finish()
+        self.__stream_parser, self.__incomplete_line = None, bytearray()
+        self.timings['parse'] = self.timings.get('parse', 0.0) + time.perf_counter() - started
+        return self.solve(parsed_input)
 
+    @abstractmethod
+    def create_stream_parser(self) -> StreamParser:
+        pass
 
-class Day2OpponentMove(Enum):
-    ROCK = 'A'
-    PAPER = 'B'
-    SCISSORS = 'C'
+    def parse_stream(self, problem_input: UploadedFile) -> Any:
+        # Streaming days parse input at hand the same way as arriving one
+        stream_parser = self.create_stream_parser()
+        with InputReader(problem_input) as reader:
+            if stream_parser.line_aligned:
+                blocks = reader.blocks(stream_parser.block_size)
+            else:
+                blocks = reader.slices(stream_parser.block_size)
+            for block in blocks:
+                if stream_parser.done:
+                    break
+                stream_parser.feed(block)
+        return stream_parser.finish()
 
+    @abstractmethod
+    def parse(self, problem_input: UploadedFile) -> Any:
+        pass
 
-class Day2PlayerMove(Enum):
-    ROCK = 'X'
-    PAPER = 'Y'
-    SCISSORS = 'Z'
+    @abstractmethod
+    def solve_part_one(self, parsed_input: Any) -> Union[int, str]:
+        pass
 
+    @abstractmethod
+    def solve_part_two(self, parsed_input: Any) -> Union[int, str]:
+        pass
 
-class Day2RoundOutcome(Enum):
-    LOSS = 'X'
-    DRAW = 'Y'
-    WIN = 'Z'
+    def copy_parsed_input(self, parsed_input: Any) -> Any:
+        # Parts only read parsed input by default, so both of them can share it
+        return parsed_input
 
 
-class Day2Resolver(Resolver):
+class Day1StreamParser(StreamParser):
 
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input))
-        ]
+    def __init__(self, top: int) -> None:
+        # Min heap keeps `top` best elfs seen so far, its root is the first one to be pushed out
+        self.top = top
+        self.elfs = []
+        self.current_elf_cal = None
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        total_score = 0
-        for line in problem_input:
-            opponent_move, player_move = self.__get_round_operands(line, Part.ONE)
-            round_outcome = self.__get_round_outcome(opponent_move, player_move)
-            total_score += self.__get_round_outcome_score(round_outcome) + self.__get_round_shape_score(player_move)
-        return total_score
-
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        total_score = 0
-        for line in problem_input:
-            opponent_move, round_outcome = self.__get_round_operands(line, Part.TWO)
-            shape_outcome_score = self.__get_player_shape_outcome_score(opponent_move, round_outcome)
-            total_score += self.__get_round_outcome_score(round_outcome) + shape_outcome_score
-        return total_score
-
-    def __get_round_operands(self, input_line: bytes, part: Part) -> ():
-        decoded_line = input_line.decode().strip()
-        if part == part.ONE:
-            opponent_move, _, player_move = list(decoded_line)
-            return Day2OpponentMove(opponent_move), Day2PlayerMove(player_move)
-        else:
-            opponent_move, _, player_round_outcome = list(decoded_line)
-            return Day2OpponentMove(opponent_move), Day2RoundOutcome(player_round_outcome)
-
-    def __get_round_outcome_score(self, round_outcome: Day2RoundOutcome) -> int:
-        if round_outcome == Day2RoundOutcome.DRAW:
-            return 3
-        elif round_outcome == Day2RoundOutcome.WIN:
-            return 6
-        else:
-            return 0
+    def feed(self, block: bytes) -> None:
+        for line in bytes(block).splitlines():
+            if line.strip():
+                # int() skips surrounding whitespace by itself
+                self.current_elf_cal = (self.current_elf_cal or 0) + int(line)
+            elif self.current_elf_cal is not None:
+                self.__add_elf(self.current_elf_cal)
+                self.current_elf_cal = None
 
-    def __get_round_outcome(self, opponent_move: Day2OpponentMove, player_move: Day2PlayerMove) -> Day2RoundOutcome:
-        if self.__is_draw(opponent_move, player_move):
-            return Day2RoundOutcome.DRAW
-        elif self.__is_win(opponent_move, player_move):
-            return Day2RoundOutcome.WIN
-        else:
-            return Day2RoundOutcome.LOSS
-
-    def __is_draw(self, opponent_move: Day2OpponentMove, player_move: Day2PlayerMove) -> bool:
-        if opponent_move == Day2OpponentMove.ROCK and player_move == Day2PlayerMove.ROCK:
-            return True
-        elif opponent_move == Day2OpponentMove.PAPER and player_move == Day2PlayerMove.PAPER:
-            return True
-        elif opponent_move == Day2OpponentMove.SCISSORS and player_move == Day2PlayerMove.SCISSORS:
-            return True
-        return False
-
-    def __is_win(self, opponent_move: Day2OpponentMove, player_move: Day2PlayerMove) -> bool:
-        if opponent_move == Day2OpponentMove.ROCK and player_move == Day2PlayerMove.PAPER:
-            return True
-        elif opponent_move == Day2OpponentMove.PAPER and player_move == Day2PlayerMove.SCISSORS:
-            return True
-        elif opponent_move == Day2OpponentMove.SCISSORS and player_move == Day2PlayerMove.ROCK:
-            return True
-        return False
-
-    def __get_round_shape_score(self, move: Union[Day2PlayerMove, Day2OpponentMove]) -> int:
-        if move in [Day2PlayerMove.ROCK, Day2OpponentMove.ROCK]:
-            return 1
-        elif move in [Day2PlayerMove.PAPER, Day2OpponentMove.PAPER]:
-            return 2
-        else:
-            return 3
+    def finish(self) -> []:
+        if self.current_elf_cal is not None:
+            self.__add_elf(self.current_elf_cal)
+        return sorted(self.elfs, reverse=True)
 
-    def __get_player_shape_outcome_score(self, opponent_move: Day2OpponentMove, round_outcome: Day2RoundOutcome) -> int:
-        draw_encounters = [
-            (Day2OpponentMove.ROCK, Day2PlayerMove.ROCK),
-            (Day2OpponentMove.PAPER, Day2PlayerMove.PAPER),
-            (Day2OpponentMove.SCISSORS, Day2PlayerMove.SCISSORS),
-        ]
+    def __add_elf(self, calories: int) -> None:
+        if len(self.elfs) < self.top:
+            heapq.heappush(self.elfs, calories)
+        elif calories > self.elfs[0]:
+            heapq.heapreplace(self.elfs, calories)
 
-        if round_outcome == Day2RoundOutcome.DRAW:
-            encounter = [encounter for encounter in draw_encounters if encounter[0] == opponent_move][0]
-            player_move = encounter[1]
-            shape_score = self.__get_round_shape_score(player_move)
-        elif round_outcome == Day2RoundOutcome.WIN:
-            if opponent_move == Day2OpponentMove.SCISSORS:
-                shape_score = 1
-            else:
-                shape_score = self.__get_round_shape_score(opponent_move) + 1
-        else:
-            if opponent_move == Day2OpponentMove.ROCK:
-                shape_score = 3
-            else:
-                shape_score = self.__get_round_shape_score(opponent_move) - 1
 
-        return shape_score
+class Day1Resolver(Resolver):
+    # Last elf used to be left out when input did not end with blank line
+    version = 2
+    streaming = True
+    options_schema = Day1Options
 
+    def parse(self, problem_input: UploadedFile) -> []:
+        return self.parse_stream(problem_input)
 
-class Day3Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    def create_stream_parser(self) -> Day1StreamParser:
+        return Day1StreamParser(self.options.top)
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        priorities_sum = 0
+    def solve_part_one(self, elfs: []) -> int:
+        return elfs[0] if elfs else 0
 
-        for line in problem_input:
-            rucksack_compartment_items = self.__get_rucksack_compartment_items(line)
-            priorities_sum += self.__get_misplaced_item_type_priority(*rucksack_compartment_items)
-        return priorities_sum
+    def solve_part_two(self, elfs: []) -> int:
+        return sum(elfs)
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        priorities_sum = 0
-        for elf_group in self.__get_elf_group(problem_input, 3):
-            priorities_sum += self.__find_elf_group_badge_priority(elf_group)
-        return priorities_sum
 
-    def __get_rucksack_compartment_items(self, raw_input: bytes) -> ():
-        decoded_line = raw_input.decode().strip()
-        decoded_line_length = len(decoded_line)
-        split = int(decoded_line_length / 2)
-        return decoded_line[0:split], decoded_line[split:]
+class Day2StreamParser(StreamParser):
+    # Blocks are counted on their copies, smaller blocks keep copies small
+    block_size = 64 * 1024
 
-    def __get_misplaced_item_type_priority(self, compartment_one: str, compartment_two: str) -> int:
-        for item in compartment_one:
-            if compartment_two.count(item) > 0:
-                return self.__get_item_type_priority(item)
-        return 0
+    def __init__(self, round_shapes: []) -> None:
+        # Score depends only on round shape, so rounds of each shape are just counted
+        self.round_counts = dict.fromkeys(round_shapes, 0)
 
-    def __get_elf_group(self, problem_input: UploadedFile, size: int) -> Generator:
-        group = []
-        for raw_input in problem_input:
-            decoded_line = raw_input.decode().strip()
-            group.append(decoded_line)
+    def feed(self, block: bytes) -> None:
+        block = bytes(block)
+        round_count = 0
+        for round_shape in self.round_counts:
+            shape_count = block.count(round_shape)
+            self.round_counts[round_shape] += shape_count
+            round_count += shape_count
+        self.count_records(block, round_count)
 
-            if len(group) == size:
-                yield tuple(group)
-                group = []
+    def finish(self) -> {}:
+        self.check_records('Invalid round format!')
+        return self.round_counts
 
-    def __find_elf_group_badge_priority(self, elf_group: ()) -> int:
-        elf_group_unique_items = set(''.join(elf_group))
-        for item in elf_group_unique_items:
-            group_check = [elf_group_items for elf_group_items in elf_group if item in elf_group_items]
-            if len(group_check) == len(elf_group):
-                return self.__get_item_type_priority(item)
-        return 0
 
-    def __get_item_type_priority(self, item: str) -> int:
-        item_types = list(string.ascii_lowercase) + list(string.ascii_uppercase)
-        return item_types.index(item) + 1
+class Day2Resolver(Resolver):
+    # Round score is shape score (rock 1, paper 2, scissors 3) plus outcome score (loss 0, draw 3, win 6).
+    # Opponent plays A rock, B paper, C scissors. In part one X, Y, Z is rock, paper, scissors to play,
+    # in part two it is loss, draw, win to achieve.
+    PART_ONE_SCORES = {
+        b'A X': 1 + 3, b'A Y': 2 + 6, b'A Z': 3 + 0,
+        b'B X': 1 + 0, b'B Y': 2 + 3, b'B Z': 3 + 6,
+        b'C X': 1 + 6, b'C Y': 2 + 0, b'C Z': 3 + 3,
+    }
+    PART_TWO_SCORES = {
+        b'A X': 3 + 0, b'A Y': 1 + 3, b'A Z': 2 + 6,
+        b'B X': 1 + 0, b'B Y': 2 + 3, b'B Z': 3 + 6,
+        b'C X': 2 + 0, b'C Y': 3 + 3, b'C Z': 1 + 6,
+    }
+    streaming = True
+
+    def parse(self, problem_input: UploadedFile) -> {}:
+        return self.parse_stream(problem_input)
+
+    def create_stream_parser(self) -> Day2StreamParser:
+        return Day2StreamParser(list(self.PART_ONE_SCORES))
+
+    def solve_part_one(self, round_counts: {}) -> int:
+        return self.__get_total_score(round_counts, self.PART_ONE_SCORES)
+
+    def solve_part_two(self, round_counts: {}) -> int:
+        return self.__get_total_score(round_counts, self.PART_TWO_SCORES)
+
+    def __get_total_score(self, round_counts: {}, scores: {}) -> int:
+        return sum(count * scores[round_shape] for round_shape, count in round_counts.items())
+
+
+class Day3StreamParser(StreamParser):
+    # Item type of priority p is bit p of rucksack mask, other bytes have no bit
+    ITEM_MASKS = [
+        1 << ((string.ascii_lowercase + string.ascii_uppercase).index(chr(byte)) + 1)
+        if chr(byte) in string.ascii_letters else 0
+        for byte in range(256)
+    ]
 
+    def __init__(self) -> None:
+        # Item types of both compartments of every rucksack as masks
+        self.rucksacks = []
 
-class Day4Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    def feed(self, block: bytes) -> None:
+        for line in bytes(block).splitlines():
+            items = line.strip()
+            split = len(items) // 2
+            self.rucksacks.append((self.__get_items_mask(items[:split]), self.__get_items_mask(items[split:])))
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        fully_contained_sections = 0
-        for line in problem_input:
-            assignment_pairs = self.__get_section_assignment_pairs(line)
-            fully_contained_sections += int(self.__is_any_section_fully_contained(assignment_pairs))
-        return fully_contained_sections
+    def finish(self) -> []:
+        return self.rucksacks
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        overlapping_sections = 0
-        for line in problem_input:
-            assignment_pairs = self.__get_section_assignment_pairs(line)
-            overlapping_sections += int(self.__is_any_section_overlapping(assignment_pairs))
-        return overlapping_sections
+    def __get_items_mask(self, items: bytes) -> int:
+        mask = 0
+        for item in set(items):
+            mask |= self.ITEM_MASKS[item]
+        return mask
 
-    def __get_section_assignment_pairs(self, raw_input: bytes) -> []:
-        decoded_line = raw_input.decode().strip()
-        pairs = decoded_line.split(',')
-        sections = []
-        for pair in pairs:
-            sections.append(tuple(int(x) for x in pair.split('-')))
-        return sections
 
-    def __is_any_section_fully_contained(self, assignment_pairs: []) -> bool:
-        pair_one, pair_two = assignment_pairs
+class Day3Resolver(Resolver):
+    streaming = True
+    options_schema = Day3Options
 
-        if pair_one[0] >= pair_two[0] and pair_one[1] <= pair_two[1]:
-            return True
-        elif pair_two[0] >= pair_one[0] and pair_two[1] <= pair_one[1]:
-            return True
+    def parse(self, problem_input: UploadedFile) -> []:
+        return self.parse_stream(problem_input)
 
-        return False
+    def create_stream_parser(self) -> Day3StreamParser:
+        return Day3StreamParser()
 
-    def __is_any_section_overlapping(self, assignment_pairs: []) -> bool:
-        pair_one, pair_two = assignment_pairs
+    def solve_part_one(self, rucksacks: []) -> int:
+        priorities_sum = 0
+        for compartment_one, compartment_two in rucksacks:
+            priorities_sum += self.__get_item_type_priority(compartment_one & compartment_two)
+        return priorities_sum
 
-        if self.__in_range(pair_two, pair_one[0]):
-            return True
-        elif self.__in_range(pair_two, pair_one[1]):
-            return True
-        elif self.__in_range(pair_one, pair_two[0]):
-            return True
-        elif self.__in_range(pair_one, pair_two[1]):
-            return True
+    def solve_part_two(self, rucksacks: []) -> int:
+        priorities_sum = 0
+        for elf_group in self.__get_elf_groups(rucksacks, self.options.group_size):
+            priorities_sum += self.__find_elf_group_badge_priority(elf_group)
+        return priorities_sum
 
-        return False
+    def __get_elf_groups(self, rucksacks: [], size: int) -> Iterator:
+        # Groups of `size` consecutive rucksacks, incomplete last group is left out
+        return zip(*[iter(rucksacks)] * size)
 
-    def __in_range(self, limits: (), value_to_check: int) -> bool:
-        a, b = limits
+    def __find_elf_group_badge_priority(self, elf_group: ()) -> int:
+        common_items = -1
+        for compartment_one, compartment_two in elf_group:
+            common_items &= compartment_one | compartment_two
+        return self.__get_item_type_priority(common_items)
 
-        if a <= value_to_check <= b:
-            return True
+    def __get_item_type_priority(self, items: int) -> int:
+        return items.bit_length() - 1 if items else 0
 
-        return False
 
+class Day4StreamParser(StreamParser):
+    # Dash between sections is not a minus sign
+    PAIR_PATTERN = re.compile(rb'^[ \t]*(\d+)-(\d+),(\d+)-(\d+)[ \t\r]*$', re.MULTILINE)
 
-class Day5Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    def __init__(self) -> None:
+        self.sections = array('L')
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> str:
-        input_as_list = self.__convert_to_list(problem_input)
-        stacks_of_crates, procedure = self.__get_main_peaces(input_as_list)
-        crates_map = self.__create_crates_map(stacks_of_crates)
-        self.__operate_crane(crates_map, procedure, Part.ONE)
-        return self.__find_top_crates(crates_map)
+    def feed(self, block: bytes) -> None:
+        block = bytes(block)
+        pairs = self.PAIR_PATTERN.findall(block)
+        self.sections.extend(map(int, chain.from_iterable(pairs)))
+        self.count_records(block, len(pairs))
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> str:
-        input_as_list = self.__convert_to_list(problem_input)
-        stacks_of_crates, procedure = self.__get_main_peaces(input_as_list)
-        crates_map = self.__create_crates_map(stacks_of_crates)
-        self.__operate_crane(crates_map, procedure, Part.TWO)
-        return self.__find_top_crates(crates_map)
+    def finish(self) -> ():
+        # Every line has to hold exactly one pair, otherwise sections of different lines would be paired
+        sections = self.sections
+        self.check_records('Invalid section assignment format!')
+        # Columns of first elf start, first elf end, second elf start and second elf end
+        return sections[0::4], sections[1::4], sections[2::4], sections[3::4]
+
+
+class Day4Resolver(Resolver):
+    streaming = True
+
+    def parse(self, problem_input: UploadedFile) -> ():
+        return self.parse_stream(problem_input)
+
+    def create_stream_parser(self) -> Day4StreamParser:
+        return Day4StreamParser()
+
+    def solve_part_one(self, assignments: ()) -> int:
+        # One section contains the other when their starts and ends differ in opposite directions or not at all
+        starts_one, ends_one, starts_two, ends_two = assignments
+        start_differences = map(operator.sub, starts_one, starts_two)
+        end_differences = map(operator.sub, ends_one, ends_two)
+        return sum(map((0).__ge__, map(operator.mul, start_differences, end_differences)))
+
+    def solve_part_two(self, assignments: ()) -> int:
+        # Sections overlap when each of them starts before the other one ends
+        starts_one, ends_one, starts_two, ends_two = assignments
+        first_before_second = map(operator.sub, ends_two, starts_one)
+        second_before_first = map(operator.sub, ends_one, starts_two)
+        return sum(map((0).__le__, map(min, first_before_second, second_before_first)))
+
+
+class Day5Input:
+
+    def __init__(self, crates_map: [], procedure: array) -> None:
+        # Every stack is bottom first, so crane works at the end of list
+        self.crates_map = crates_map
+        # Flat (crates to move, source stack index, destination stack index) triples
+        self.procedure = procedure
+
+
+class Day5TreapNode:
+    __slots__ = ('crate', 'priority', 'size', 'left', 'right', 'reversed')
+
+    def __init__(self, crate: str, priority: float) -> None:
+        self.crate = crate
+        self.priority = priority
+        self.size = 1
+        self.left = None
+        self.right = None
+        # Children are yet to be swapped, flag is pushed down lazily once node is visited
+        self.reversed = False
+
+
+class Day5CrateStack:
+    """
+    Stack of crates kept as implicit treap, position of crate is given by sizes of subtrees.
+    Taking or putting any number of crates costs O(log n), reversing them is a flag flip.
+    """
+
+    def __init__(self, crates: [], rng: random.Random) -> None:
+        self.__rng = rng
+        self.__root = self.__build(crates)
+
+    def __len__(self) -> int:
+        return self.__size(self.__root)
+
+    def take(self, crates_count: int) -> 'Day5CrateStack':
+        taken = Day5CrateStack([], self.__rng)
+        self.__root, taken.__root = self.__split(self.__root, self.__size(self.__root) - crates_count)
+        return taken
+
+    def put(self, crates: 'Day5CrateStack', reverse: bool = False) -> None:
+        if reverse and crates.__root is not None:
+            crates.__root.reversed = not crates.__root.reversed
+        self.__root = self.__merge(self.__root, crates.__root)
+        crates.__root = None
+
+    def top(self) -> Union[str, None]:
+        node = self.__root
+        while node is not None:
+            self.__push(node)
+            if node.right is None:
+                return node.crate
+            node = node.right
+        return None
+
+    def __build(self, crates: []) -> Union[Day5TreapNode, None]:
+        # Cartesian tree of random priorities built in linear time, right spine is kept on stack
+        spine = []
+        for crate in crates:
+            node = Day5TreapNode(crate, self.__rng.random())
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+                self.__update(last)
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+
+        root = spine[0] if spine else None
+        while spine:
+            self.__update(spine.pop())
+        return root
+
+    def __size(self, node: Union[Day5TreapNode, None]) -> int:
+        return node.size if node is not None else 0
+
+    def __update(self, node: Day5TreapNode) -> None:
+        node.size = 1 + self.__size(node.left) + self.__size(node.right)
+
+    def __push(self, node: Day5TreapNode) -> None:
+        if node.reversed:
+            node.left, node.right = node.right, node.left
+            for child in (node.left, node.right):
+                if child is not None:
+                    child.reversed = not child.reversed
+            node.reversed = False
+
+    def __split(self, node: Union[Day5TreapNode, None], count: int) -> ():
+        # Returns first `count` crates and the rest
+        if node is None:
+            return None, None
+
+        self.__push(node)
+        if count <= self.__size(node.left):
+            left, node.left = self.__split(node.left, count)
+            self.__update(node)
+            return left, node
+        else:
+            node.right, right = self.__split(node.right, count - self.__size(node.left) - 1)
+            self.__update(node)
+            return node, right
+
+    def __merge(self, left: Union[Day5TreapNode, None],
+                right: Union[Day5TreapNode, None]) -> Union[Day5TreapNode, None]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        if left.priority > right.priority:
+            self.__push(left)
+            left.right = self.__merge(left.right, right)
+            self.__update(left)
+            return left
+        else:
+            self.__push(right)
+            right.left = self.__merge(left, right.left)
+            self.__update(right)
+            return right
 
-    def __convert_to_list(self, problem_input: UploadedFile) -> []:
-        result = []
-        for line in problem_input:
-            result.append(line.decode().rstrip())
-        return result
 
-    def __get_main_peaces(self, input_as_list: []) -> ():
-        split = input_as_list.index('')
-        return input_as_list[0:split], input_as_list[split + 1:]
+class Day5Resolver(Resolver):
+    OPERATION_PATTERN = re.compile(rb'move (\d+) from (\d+) to (\d+)')
+    options_schema = Day5Options
+
+    def parse(self, problem_input: UploadedFile) -> Day5Input:
+        with InputReader(problem_input) as reader:
+            lines = reader.lines()
+            crates_map = self.__create_crates_map(self.__read_stacks_of_crates(lines))
+            procedure = array('L')
+            for line in lines:
+                operation = line.strip()
+                if operation:
+                    procedure.extend(self.__parse_operation(operation))
+        return Day5Input(crates_map, procedure)
+
+    def copy_parsed_input(self, parsed_input: Day5Input) -> Day5Input:
+        # Crane operations rearrange stacks in place, procedure itself is only read
+        return Day5Input([crate_stack[:] for crate_stack in parsed_input.crates_map], parsed_input.procedure)
+
+    def solve_part_one(self, parsed_input: Day5Input) -> str:
+        return self.__operate_crane(parsed_input.crates_map, parsed_input.procedure, Part.ONE)
+
+    def solve_part_two(self, parsed_input: Day5Input) -> str:
+        return self.__operate_crane(parsed_input.crates_map, parsed_input.procedure, Part.TWO)
+
+    def __read_stacks_of_crates(self, lines: Iterator) -> []:
+        stacks_of_crates = []
+        # Only drawing of stacks is decoded, it is a few lines long
+        for line in lines:
+            stacks_row = line.decode().rstrip()
+            if not stacks_row:
+                break
+            stacks_of_crates.append(stacks_row)
+        return stacks_of_crates
 
     def __create_crates_map(self, stacks_of_crates: []) -> []:
-        map_size = stacks_of_crates.pop().strip()
-        map_size = int(map_size[len(map_size) - 1])
+        map_size = len(stacks_of_crates.pop().split())
         crates_map = [[] for _ in range(map_size)]
-        for stack_row in stacks_of_crates:
+        for stack_row in reversed(stacks_of_crates):
             for idx, crate in enumerate(self.__read_map_row(stack_row)):
-                if crate.strip() != '':
+                if crate != ' ':
                     crates_map[idx].append(crate)
         return crates_map
 
-    def __read_map_row(self, stacks_row: str) -> Generator:
-        chunk_size = 3
-        for i in range(0, len(stacks_row), chunk_size + 1):
-            chunk = stacks_row[i:i + chunk_size]
-            yield chunk
-
-    def __operate_crane(self, crates_map: [], procedure: [], part: Part) -> None:
-        for operation in procedure:
-            crates_to_move, from_stack, to_stack = self.__parse_operation(operation)
-            if part == Part.ONE:
-                self.__execute_crate_mover_9000_operation(crates_map, crates_to_move, from_stack, to_stack)
-            else:
-                self.__execute_crate_mover_9001_operation(crates_map, crates_to_move, from_stack, to_stack)
-
-    def __parse_operation(self, operation: str) -> ():
-        result = re.match(r'move (\d+) from (\d+) to (\d+)', operation)
-        return tuple([int(group) for group in list(result.groups())])
-
-    def __execute_crate_mover_9000_operation(self, crates_map: [], crates_to_move: int, from_stack: int,
-                                             to_stack: int) -> None:
-        for _ in range(crates_to_move):
-            source_stack = crates_map[from_stack - 1]
-            destination_stack = crates_map[to_stack - 1]
-            crate_to_move = source_stack.pop(0)
-            destination_stack.insert(0, crate_to_move)
-
-    def __execute_crate_mover_9001_operation(self, crates_map: [], crates_to_move: int, from_stack: int,
-                                             to_stack: int) -> None:
-        source_stack = crates_map[from_stack - 1]
-        destination_stack = crates_map[to_stack - 1]
-        transferable_crates = source_stack[0:crates_to_move]
-        crates_map[to_stack - 1] = transferable_crates + destination_stack
-        crates_map[from_stack - 1] = source_stack[crates_to_move:]
+    def __read_map_row(self, stacks_row: str) -> str:
+        # Crate names sit on every fourth position, e.g. `[A] [B]`
+        return stacks_row[1::4]
+
+    def __operate_crane(self, crates_map: [], procedure: array, part: Part) -> str:
+        operations = zip(*[iter(procedure)] * 3)
+        if self.options.mode == 'treap':
+            return self.__execute_treap_operations(crates_map, operations, reverse=part == Part.ONE)
+
+        if part == Part.ONE:
+            self.__execute_crate_mover_9000_operations(crates_map, operations)
+        else:
+            self.__execute_crate_mover_9001_operations(crates_map, operations)
+        return self.__find_top_crates(crates_map)
+
+    def __parse_operation(self, operation: bytes) -> ():
+        result = self.OPERATION_PATTERN.match(operation)
+        if not result:
+            raise RuntimeError('Invalid operation format!')
+        crates_to_move, from_stack, to_stack = result.groups()
+        return int(crates_to_move), int(from_stack) - 1, int(to_stack) - 1
+
+    def __execute_crate_mover_9000_operations(self, crates_map: [], operations: Iterator) -> None:
+        # Crates are moved one by one, so they land on destination in reversed order
+        for crates_to_move, from_stack, to_stack in operations:
+            if crates_to_move:
+                source_stack = crates_map[from_stack]
+                crates_map[to_stack].extend(source_stack[:-crates_to_move - 1:-1])
+                del source_stack[-crates_to_move:]
+
+    def __execute_crate_mover_9001_operations(self, crates_map: [], operations: Iterator) -> None:
+        for crates_to_move, from_stack, to_stack in operations:
+            if crates_to_move:
+                source_stack = crates_map[from_stack]
+                crates_map[to_stack].extend(source_stack[-crates_to_move:])
+                del source_stack[-crates_to_move:]
+
+    def __execute_treap_operations(self, crates_map: [], operations: Iterator, reverse: bool) -> str:
+        # CrateMover 9000 moves crates one by one, so moved crates end up reversed
+        rng = random.Random(0)  # fixed seed keeps shape of trees and so the run time reproducible
+        crate_stacks = [Day5CrateStack(crate_stack, rng) for crate_stack in crates_map]
+        for crates_to_move, from_stack, to_stack in operations:
+            if crates_to_move:
+                crate_stacks[to_stack].put(crate_stacks[from_stack].take(crates_to_move), reverse)
+        return ''.join(crate_stack.top() for crate_stack in crate_stacks if len(crate_stack))
 
     def __find_top_crates(self, crates_map: []) -> str:
-        top_crates = ''
-        for crate_stack in crates_map:
-            top_crates += re.match(r'\[(\w+)', crate_stack[0]).group(1)
-        return top_crates
+        return ''.join(crate_stack[-1] for crate_stack in crates_map if crate_stack)
+
+
+class Day6StreamParser(StreamParser):
+    # Datastream is a single line, it is read as it comes instead of waiting for the line to complete
+    line_aligned = False
+    block_size = 64 * 1024
+
+    DATASTREAM_END = b'\r\n'
+
+    def __init__(self, marker_lengths: ()) -> None:
+        # Position right after the marker for each marker length, 0 when there is none
+        self.markers = dict.fromkeys(marker_lengths, 0)
+        self.pending_lengths = sorted(set(marker_lengths), reverse=True)
+        self.marker_length = self.pending_lengths.pop()
+
+        # Window of distinct bytes ending at current position starts right after last repeated byte
+        self.last_seen = [-1] * 256
+        self.window_start = 0
+        self.position = 0
+
+    def feed(self, block: bytes) -> None:
+        # Reading stops at the end of datastream or once all markers are found
+        self.done = self.__find_markers(block)
+
+    def finish(self) -> {}:
+        return self.markers
+
+    def __find_markers(self, block: bytes) -> bool:
+        last_seen, window_start, position = self.last_seen, self.window_start, self.position
+        try:
+            for byte in block:
+                if byte in self.DATASTREAM_END:
+                    return True
+
+                if last_seen[byte] >= window_start:
+                    window_start = last_seen[byte] + 1
+                last_seen[byte] = position
+                position += 1
+
+                # Windows only grow by one, so one marker length is reached at a time
+                if position - window_start == self.marker_length:
+                    self.markers[self.marker_length] = position
+                    if not self.pending_lengths:
+                        return True
+                    self.marker_length = self.pending_lengths.pop()
+            return False
+        finally:
+            self.window_start, self.position = window_start, position
 
 
 class Day6Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    # Windows cut short by end of line used to count as markers
+    version = 2
+    streaming = True
+    options_schema = Day6Options
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        return self.__find_marker(problem_input, 4)
+    def parse(self, problem_input: UploadedFile) -> {}:
+        # Both markers are searched for in one pass
+        return self.parse_stream(problem_input)
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        return self.__find_marker(problem_input, 14)
+    def create_stream_parser(self) -> Day6StreamParser:
+        return Day6StreamParser((self.options.packet_marker_length, self.options.message_marker_length))
 
-    def __find_marker(self, problem_input: UploadedFile, marker_chunk_size: int) -> int:
-        for line in problem_input:
-            decoded_line = line.decode().strip()
-            for i in range(0, len(decoded_line)):
-                chunk = decoded_line[i: i + marker_chunk_size]
-                if len(chunk) == len(set(chunk)):
-                    return i + marker_chunk_size
-        return 0
+    def solve_part_one(self, markers: {}) -> int:
+        return markers[self.options.packet_marker_length]
+
+    def solve_part_two(self, markers: {}) -> int:
+        return markers[self.options.message_marker_length]
 
 
 class Day7FileType(Enum):
@@ -393,13 +664,15 @@ class Day7FileType(Enum):
 
 
 class Day7File:
+    # Transcripts may list millions of files, slots keep every node small
+    __slots__ = ('__type', '__size', '__name', '__parent', '__children')
 
     def __init__(self) -> None:
         self.__type = Day7FileType.DIR
         self.__size = 0
         self.__name = '/'
         self.__parent = None
-        self.__children = []
+        self.__children = {}
 
     def set_type(self, file_type: Day7FileType) -> None:
         self.__type = file_type
@@ -414,13 +687,8 @@ class Day7File:
         self.__size = size
 
     def get_size(self) -> int:
-        if self.__type == Day7FileType.DIR:
-            total = 0
-            for child in self.__children:
-                total += child.get_size()
-            return total
-        else:
-            return self.__size
+        # Directory size is total of its files, it is known once `calculate_sizes` ran on the tree
+        return self.__size
 
     def set_name(self, name: str) -> None:
         self.__name = name
@@ -435,69 +703,92 @@ class Day7File:
         return self.__parent
 
     def add_child(self, child: 'Day7File') -> None:
-        if not any(child_item.get_name() == child.get_name() for child_item in self.__children):
-            self.__children.append(child)
+        if child.get_name() not in self.__children:
+            self.__children[child.get_name()] = child
+
+    def get_child(self, name: str) -> Union['Day7File', None]:
+        return self.__children.get(name)
 
     def get_children(self) -> []:
-        return self.__children
+        return list(self.__children.values())
+
+    def get_directories(self) -> Generator:
+        # This directory and all its subdirectories, parents come before their subdirectories
+        directories = [self]
+        while directories:
+            directory = directories.pop()
+            yield directory
+            directories.extend(child for child in directory.__children.values() if child.is_dir())
+
+    def get_path(self) -> str:
+        names = []
+        node = self
+        while node.__parent is not None:
+            names.append(node.__name)
+            node = node.__parent
+        return '/' + '/'.join(reversed(names))
+
+    def calculate_sizes(self) -> None:
+        # Parents come before their subdirectories, so reversed order sums children before their parent
+        for directory in reversed(list(self.get_directories())):
+            directory.__size = sum(child.__size for child in directory.__children.values())
 
 
 class Day7Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    # Revisited directories used to be replaced by detached copies
+    version = 2
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
+    def parse(self, problem_input: UploadedFile) -> Day7File:
         file_tree = self.__create_file_tree(problem_input)
-        file_tree = self.__change_directory('/', file_tree)
-        total = 0
-        for directory in self.__find_directories(file_tree, 100000):
-            total += directory.get_size()
-        return total
+        file_tree.calculate_sizes()
+        return file_tree
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        file_tree = self.__create_file_tree(problem_input)
-        file_tree = self.__change_directory('/', file_tree)
+    def solve_part_one(self, file_tree: Day7File) -> int:
+        return sum(size for size in self.__get_directory_sizes(file_tree) if size <= 100000)
+
+    def solve_part_two(self, file_tree: Day7File) -> int:
         filesystem_space = 70000000
         update_required_space = 30000000
         used_space = file_tree.get_size()
         free_space = filesystem_space - used_space
 
-        best_deletion_candidate = None
-        found_directories = self.__find_directories(file_tree, update_required_space)
-        found_directories.sort(key=lambda x: x.get_size(), reverse=True)
-
-        for directory in found_directories:
-            if update_required_space <= (directory.get_size() + free_space):
-                best_deletion_candidate = directory
+        return min(size for size in self.__get_directory_sizes(file_tree) if update_required_space <= size + free_space)
 
-        return best_deletion_candidate.get_size()
+    def __get_directory_sizes(self, file_tree: Day7File) -> Generator:
+        for directory in file_tree.get_directories():
+            if directory is not file_tree:
+                yield directory.get_size()
 
     def __create_file_tree(self, problem_input: UploadedFile) -> Day7File:
-        current_directory = Day7File()
-
-        for raw_input in problem_input:
-            decoded_line = raw_input.decode().strip()
-            if decoded_line[0] == '$':
-                current_directory = self.__perform_command(decoded_line, current_directory)
-            else:
-                self.__read_file_listing(decoded_line, current_directory)
-
-        return current_directory
-
-    def __perform_command(self, decoded_line: str, current_directory: Day7File) -> Day7File:
-        matcher = re.match(r'\$ cd (\w+|/|\.{2})', decoded_line)
-        if matcher:
-            return self.__change_directory(matcher.group(1), current_directory)
+        # Transcript is read line by line and root is kept at hand, so neither input size nor tree depth matters
+        root = Day7File()
+        current_directory = root
+
+        with InputReader(problem_input) as reader:
+            for raw_line in reader.lines():
+                line = raw_line.strip()
+                if not line:
+                    continue
+                if line.startswith(b'$'):
+                    current_directory = self.__perform_command(line, root, current_directory)
+                else:
+                    self.__read_file_listing(line, current_directory)
+
+        return root
+
+    def __perform_command(self, line: bytes, root: Day7File, current_directory: Day7File) -> Day7File:
+        # Only names are decoded, they become paths in reports
+        if line.startswith(b'$ cd '):
+            return self.__change_directory(line[5:].strip().decode(), root, current_directory)
         else:
             return current_directory
 
-    def __read_file_listing(self, decoded_line: str, current_directory: Day7File) -> None:
-        matcher = re.match(r'(\d+)\s+([\w.]+)', decoded_line)
-        if matcher:
-            directory_file = self.__create_directory_file(name=matcher.group(2), size=int(matcher.group(1)))
+    def __read_file_listing(self, line: bytes, current_directory: Day7File) -> None:
+        size, name = line.split(maxsplit=1)
+        if size == b'dir':
+            self.__get_directory(name.decode(), current_directory)
+        elif size.isdigit():
+            directory_file = self.__create_directory_file(name=name.decode(), size=int(size))
             current_directory.add_child(directory_file)
             directory_file.set_parent(current_directory)
 
@@ -506,25 +797,22 @@ class Day7Resolver(Resolver):
         directory.set_name(name)
         return directory
 
-    def __change_directory(self, directory_name: str, current_directory: Day7File) -> Day7File:
+    def __change_directory(self, directory_name: str, root: Day7File, current_directory: Day7File) -> Day7File:
         if directory_name == '/':
-            return self.__navigate_to_root(current_directory)
+            return root
         elif directory_name == '..':
             return self.__navigate_to_parent(current_directory)
         else:
-            directory = self.__create_directory(directory_name)
-
-            if isinstance(current_directory, Day7File):
-                current_directory.add_child(directory)
-                directory.set_parent(current_directory)
-
-            return directory
+            return self.__get_directory(directory_name, current_directory)
 
-    def __navigate_to_root(self, current_directory: Day7File) -> Day7File:
-        if current_directory.get_parent() is not None:
-            return self.__navigate_to_root(current_directory.get_parent())
-        else:
-            return current_directory
+    def __get_directory(self, directory_name: str, current_directory: Day7File) -> Day7File:
+        # Directory may be visited or listed many times, it has to stay the same node
+        directory = current_directory.get_child(directory_name)
+        if directory is None:
+            directory = self.__create_directory(directory_name)
+            current_directory.add_child(directory)
+            directory.set_parent(current_directory)
+        return directory
 
     def __navigate_to_parent(self, current_directory: Day7File) -> Day7File:
         if current_directory.get_parent() is not None:
@@ -539,369 +827,284 @@ class Day7Resolver(Resolver):
         directory_file.set_type(Day7FileType.FILE)
         return directory_file
 
-    def __find_directories(self, file_tree: Day7File, smaller_than_or_equal: int) -> []:
-        found_directories = []
-        for child in file_tree.get_children():
-            if child.is_dir():
-                found_directories += self.__find_directories(child, smaller_than_or_equal)
-                if child.get_size() <= smaller_than_or_equal:
-                    found_directories.append(child)
-        return found_directories
-
 
 class Day8Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    execution_backend = 'process'
+    parallel_parts = True
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        grid = {}
-        for row_idx, raw_input in enumerate(problem_input):
-            decoded_line = raw_input.decode().strip()
-            self.__read_grid(grid, decoded_line, row_idx)
+    TALLEST_TREE = ord('9')
 
-        return self.__find_visible_trees(grid)
+    def parse(self, problem_input: UploadedFile) -> ByteGrid:
+        # Tree heights stay ASCII digits, digits compare the same way as heights
+        with InputReader(problem_input) as reader:
+            return reader.grid()
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        grid = {}
-        for row_idx, raw_input in enumerate(problem_input):
-            decoded_line = raw_input.decode().strip()
-            self.__read_grid(grid, decoded_line, row_idx)
+    def solve_part_one(self, grid: ByteGrid) -> int:
+        return self.__find_visible_trees(grid)
 
+    def solve_part_two(self, grid: ByteGrid) -> int:
         return self.__calculate_trees_scenic_score(grid)
 
-    def __read_grid(self, grid: {}, decoded_line: str, row_idx: int) -> None:
-        for col_idx, tree_height in enumerate(decoded_line):
-            grid[(col_idx, row_idx)] = int(tree_height)
-
-    def __get_grid_size(self, grid: {}) -> ():
-        width = max(grid.keys(), key=lambda x: x[0])[0]
-        height = max(grid.keys(), key=lambda y: y[1])[1]
-        # because 0 based
-        return width + 1, height + 1
-
-    def __find_visible_trees(self, grid: {}) -> int:
-        grid_width, grid_height = self.__get_grid_size(grid)
-        visible_trees = 0
-
-        for position, tree_height in grid.items():
-            position_x, position_y = position
-            if position_x == 0 or position_x == (grid_width - 1):
-                visible_trees += 1
-            elif position_y == 0 or position_y == (grid_height - 1):
-                visible_trees += 1
-            else:
-                visible_trees += self.__is_interior_tree_visible(position, tree_height, grid) is True
-
-        return visible_trees
-
-    def __is_interior_tree_visible(self, position: (), tree_height: int, grid: {}) -> bool:
-        tree_x, tree_y = position
-        hidden = {
-            'N': False,
-            'E': False,
-            'S': False,
-            'W': False
-        }
-
-        # movement from point
-        step = 1
-        while True:
-
-            # not visible from top?
-            if (tree_x, tree_y - step) in grid and hidden['N'] is False and \
-                    grid[(tree_x, tree_y - step)] >= tree_height:
-                hidden['N'] = True
-
-            # not visible from right?
-            if (tree_x + step, tree_y) in grid and hidden['E'] is False and \
-                    grid[(tree_x + step, tree_y)] >= tree_height:
-                hidden['E'] = True
-
-            # not visible from bottom?
-            if (tree_x, tree_y + step) in grid and hidden['S'] is False and \
-                    grid[(tree_x, tree_y + step)] >= tree_height:
-                hidden['S'] = True
-
-            # not visible from left?
-            if (tree_x - step, tree_y) in grid and hidden['W'] is False and \
-                    grid[(tree_x - step, tree_y)] >= tree_height:
-                hidden['W'] = True
-
-            if all(hidden.values()):
-                return False
-
-            # outside grid?
-            if (tree_x, tree_y - step) not in grid and \
-                    (tree_x + step, tree_y) not in grid and \
-                    (tree_x, tree_y + step) not in grid and \
-                    (tree_x - step, tree_y) not in grid:
-                return True
-
-            step += 1
-
-    def __calculate_trees_scenic_score(self, grid: {}) -> int:
-        grid_width, grid_height = self.__get_grid_size(grid)
-        scenic_score = []
-
-        for position, tree_height in grid.items():
-            position_x, position_y = position
-            if position_x == 0 or position_x == (grid_width - 1):
-                continue
-            elif position_y == 0 or position_y == (grid_height - 1):
-                continue
+    def __find_visible_trees(self, grid: ByteGrid) -> int:
+        width, height = grid.width, grid.height
+        visible = bytearray(width * height)
+
+        for row_idx, row in enumerate(grid.get_rows()):
+            row_start = row_idx * width
+            for col_idx in self.__get_visible_from_start(row):
+                visible[row_start + col_idx] = 1
+            for col_idx in self.__get_visible_from_start(row[::-1]):
+                visible[row_start + width - 1 - col_idx] = 1
+
+        for col_idx, column in enumerate(grid.get_columns()):
+            for row_idx in self.__get_visible_from_start(column):
+                visible[row_idx * width + col_idx] = 1
+            for row_idx in self.__get_visible_from_start(column[::-1]):
+                visible[(height - 1 - row_idx) * width + col_idx] = 1
+
+        return visible.count(1)
+
+    def __get_visible_from_start(self, line: bytes) -> []:
+        # Running maximum of heights, nothing behind the tallest possible tree can be seen
+        visible = []
+        tallest = -1
+        for idx, tree_height in enumerate(line):
+            if tree_height > tallest:
+                visible.append(idx)
+                tallest = tree_height
+                if tallest == self.TALLEST_TREE:
+                    break
+        return visible
+
+    def __calculate_trees_scenic_score(self, grid: ByteGrid) -> int:
+        width = grid.width
+        # Vertical part of every score, edge trees see nothing in one direction so their score is 0
+        vertical_scores = array('I', bytes(4 * width * grid.height))
+        for col_idx, column in enumerate(grid.get_columns()):
+            up = self.__get_viewing_distances(column)
+            down = self.__get_viewing_distances(column[::-1])[::-1]
+            vertical_scores[col_idx::width] = array('I', map(operator.mul, up, down))
+
+        scenic_score = 0
+        for row_idx, row in enumerate(grid.get_rows()):
+            left = self.__get_viewing_distances(row)
+            right = self.__get_viewing_distances(row[::-1])[::-1]
+            row_vertical_scores = vertical_scores[row_idx * width:(row_idx + 1) * width]
+            scenic_score = max(scenic_score, max(map(operator.mul, map(operator.mul, left, right), row_vertical_scores)))
+
+        return scenic_score
+
+    def __get_viewing_distances(self, line: bytes) -> []:
+        # Monotonic stack holds trees which can still block the view of following trees
+        distances = []
+        blocking_heights = []
+        blocking_indexes = []
+        for idx, tree_height in enumerate(line):
+            while blocking_heights and blocking_heights[-1] < tree_height:
+                blocking_heights.pop()
+                blocking_indexes.pop()
+            distances.append(idx - blocking_indexes[-1] if blocking_indexes else idx)
+            blocking_heights.append(tree_height)
+            blocking_indexes.append(idx)
+        return distances
+
+
+class Day9Rope:
+    # Coordinates are packed as x and y shifted to unsigned 32 bit halves of single integer
+    COORDINATE_OFFSET = 1 << 31
+    X_UNIT = 1 << 32
+
+    def __init__(self, tracked_knots: []) -> None:
+        # Head is knot 0, rope only needs to reach the last tracked knot. Knot `k` moves the same way as tail
+        # of `k` knots long rope, so one rope answers every tracked knot.
+        knot_count = max(tracked_knots)
+        self.xs = [0] * (knot_count + 1)
+        self.ys = [0] * (knot_count + 1)
+        self.unique_visits = [None] * (knot_count + 1)
+        for knot in tracked_knots:
+            self.unique_visits[knot] = {self.pack(0, 0)}
+
+    def pack(self, x: int, y: int) -> int:
+        return (x + self.COORDINATE_OFFSET) * self.X_UNIT + y + self.COORDINATE_OFFSET
+
+    def get_unique_visits_count(self, knot: int) -> int:
+        return len(self.unique_visits[knot])
+
+    def move(self, dx: int, dy: int, steps: int) -> None:
+        xs, ys, unique_visits = self.xs, self.ys, self.unique_visits
+        tail = len(xs) - 1
+        for step in range(steps):
+            xs[0] += dx
+            ys[0] += dy
+
+            in_lockstep = True
+            for idx in range(1, tail + 1):
+                distance_x = xs[idx - 1] - xs[idx]
+                distance_y = ys[idx - 1] - ys[idx]
+                # Knot which stays in place leaves the rest of rope in place as well
+                if -1 <= distance_x <= 1 and -1 <= distance_y <= 1:
+                    break
+
+                knot_dx = (distance_x > 0) - (distance_x < 0)
+                knot_dy = (distance_y > 0) - (distance_y < 0)
+                xs[idx] += knot_dx
+                ys[idx] += knot_dy
+                in_lockstep = in_lockstep and knot_dx == dx and knot_dy == dy
+                if unique_visits[idx] is not None:
+                    unique_visits[idx].add(self.pack(xs[idx], ys[idx]))
             else:
-                scenic_score.append(self.__calculate_tree_scenic_score(position, tree_height, grid))
-
-        return max(scenic_score)
-
-    def __calculate_tree_scenic_score(self, position, tree_height, grid) -> int:
-        tree_x, tree_y = position
-        block_reached = {
-            'N': False,
-            'E': False,
-            'S': False,
-            'W': False
-        }
-        tree_scenic_score = {
-            'N': 0,
-            'E': 0,
-            'S': 0,
-            'W': 0
-        }
-
-        # movement from point
-        step = 1
-        while True:
-
-            # not visible from top?
-            if (tree_x, tree_y - step) in grid and block_reached['N'] is False:
-                block_reached['N'] = grid[(tree_x, tree_y - step)] >= tree_height
-                tree_scenic_score['N'] = step
-
-            # not visible from right?
-            if (tree_x + step, tree_y) in grid and block_reached['E'] is False:
-                block_reached['E'] = grid[(tree_x + step, tree_y)] >= tree_height
-                tree_scenic_score['E'] = step
-
-            # not visible from bottom?
-            if (tree_x, tree_y + step) in grid and block_reached['S'] is False:
-                block_reached['S'] = grid[(tree_x, tree_y + step)] >= tree_height
-                tree_scenic_score['S'] = step
-
-            # not visible from left?
-            if (tree_x - step, tree_y) in grid and block_reached['W'] is False:
-                block_reached['W'] = grid[(tree_x - step, tree_y)] >= tree_height
-                tree_scenic_score['W'] = step
+                if in_lockstep:
+                    self.__move_taut(dx, dy, steps - step - 1)
+                    return
+
+    def __move_taut(self, dx: int, dy: int, steps: int) -> None:
+        # Whole rope moved as the head did, distances between knots stay the same for the rest of motion
+        # so every knot keeps moving with the head along a straight line
+        step = dx * self.X_UNIT + dy
+        for idx in range(len(self.xs)):
+            if self.unique_visits[idx] is not None:
+                visit = self.pack(self.xs[idx], self.ys[idx])
+                self.unique_visits[idx].update(range(visit + step, visit + step * (steps + 1), step))
+            self.xs[idx] += dx * steps
+            self.ys[idx] += dy * steps
+
+
+class Day9StreamParser(StreamParser):
+    OPERATION_PATTERN = re.compile(rb'([URDL])\s+(\d+)')
+    DIRECTIONS = {
+        b'U': (0, -1),
+        b'R': (1, 0),
+        b'D': (0, 1),
+        b'L': (-1, 0),
+    }
+
+    def __init__(self, knots: []) -> None:
+        self.knots = knots
+        self.rope = Day9Rope(knots)
+
+    def feed(self, block: bytes) -> None:
+        for raw_line in bytes(block).splitlines():
+            line = raw_line.strip()
+            if line:
+                direction, moves = self.__parse_operation(line)
+                self.rope.move(*self.DIRECTIONS[direction], int(moves))
+
+    def finish(self) -> {}:
+        return {knot: self.rope.get_unique_visits_count(knot) for knot in self.knots}
+
+    def __parse_operation(self, raw_op: bytes) -> ():
+        matcher = self.OPERATION_PATTERN.match(raw_op)
+        if matcher:
+            return matcher.groups()
+        else:
+            raise RuntimeError('Invalid operation format!')
 
-            if all(block_reached.values()):
-                return reduce((lambda x, y: x * y), tree_scenic_score.values())
 
-            # outside grid?
-            if (tree_x, tree_y - step) not in grid and \
-                    (tree_x + step, tree_y) not in grid and \
-                    (tree_x, tree_y + step) not in grid and \
-                    (tree_x - step, tree_y) not in grid:
-                return reduce((lambda x, y: x * y), tree_scenic_score.values())
+class Day9Resolver(Resolver):
+    # Longest rope is simulated once while parsing, both parts only read its knots
+    execution_backend = 'process'
+    streaming = True
+    options_schema = Day9Options
 
-            step += 1
+    def parse(self, problem_input: UploadedFile) -> {}:
+        return self.parse_stream(problem_input)
 
+    def create_stream_parser(self) -> Day9StreamParser:
+        return Day9StreamParser(self.options.knots)
 
-class Day9MoveState:
+    def solve_part_one(self, unique_visits: {}) -> int:
+        return unique_visits[self.options.knots[0]]
 
-    def __init__(self, knot_count=1) -> None:
-        self.head = [0, 0]
-        self.knots = [[0, 0] for _ in range(knot_count)]
-        self.unique_tail_visits = {(0, 0)}
+    def solve_part_two(self, unique_visits: {}) -> int:
+        return unique_visits[self.options.knots[-1]]
 
-    def __str__(self) -> str:
-        new_line = '\n'
-        inner_indent = '\t\t'
-        return f"""Current state is:
-\tHead at: ({self.head[0]}, {self.head[1]})
-\tKnots at:
-{f"{new_line}".join(f"{inner_indent}[{index}]: ({knot[0]}, {knot[1]})" for index, knot in enumerate(self.knots, 1))}
-\tUnique visits: {self.unique_tail_visits}
---------------------------------"""
 
+class Day10Program:
 
-class Day9Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
-
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        state = Day9MoveState()
-        return self.__solve(problem_input, state)
+    def __init__(self) -> None:
+        # Register X changes only after `addx`, so program is kept as cycles where X gets new value.
+        # X during cycle `c` is the value of the last change starting at or before `c`.
+        self.change_cycles = array('q', [1])
+        self.x_values = array('q', [1])
+        self.cycle_count = 0
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        state = Day9MoveState(9)
-        return self.__solve(problem_input, state)
+    def add_instruction(self, cycles: int, increase: int = 0) -> None:
+        self.cycle_count += cycles
+        if increase:
+            self.change_cycles.append(self.cycle_count + 1)
+            self.x_values.append(self.x_values[-1] + increase)
 
-    def __solve(self, problem_input: UploadedFile, state: Day9MoveState) -> int:
-        for raw_input in problem_input:
-            decoded_line = raw_input.decode().strip()
-            direction, moves = self.__parse_operation(decoded_line)
-            self.__perform_move(direction, int(moves), state)
-        return len(state.unique_tail_visits)
+    def get_x(self, cycle: int) -> int:
+        return self.x_values[bisect.bisect_right(self.change_cycles, cycle) - 1]
 
-    def __parse_operation(self, raw_op: str) -> ():
-        matcher = re.match(r'(\w+)\s+(\d+)', raw_op)
-        if matcher:
-            return matcher.groups()
-        else:
-            raise RuntimeError('Invalid operation format!')
 
-    def __perform_move(self, direction: str, move_count: int, state: Day9MoveState) -> None:
-        # TODO: abstract to move (find positive/negative direction, assign increment/decrement to x/y)
-        if direction == 'U':
-            self.__move_up(move_count, state)
-        elif direction == 'R':
-            self.__move_right(move_count, state)
-        elif direction == 'D':
-            self.__move_down(move_count, state)
-        else:
-            self.__move_left(move_count, state)
-
-    def __move_up(self, move_count: int, state: Day9MoveState) -> None:
-        head = state.head
-        for i in range(0, move_count):
-            head[1] = head[1] - 1
-            self.__make_tail_move(state, head)
-
-    def __move_right(self, move_count: int, state: Day9MoveState) -> None:
-        head = state.head
-        for i in range(0, move_count):
-            head[0] = head[0] + 1
-            self.__make_tail_move(state, head)
-
-    def __move_down(self, move_count: int, state: Day9MoveState) -> None:
-        head = state.head
-        for i in range(0, move_count):
-            head[1] = head[1] + 1
-            self.__make_tail_move(state, head)
-
-    def __move_left(self, move_count: int, state: Day9MoveState) -> None:
-        head = state.head
-        for i in range(0, move_count):
-            head[0] = head[0] - 1
-            self.__make_tail_move(state, head)
-
-    def __is_tail_knot_move_required(self, knot_a: [], knot_b: []) -> bool:
-        return abs(knot_a[0] - knot_b[0]) > 1 or abs(knot_a[1] - knot_b[1]) > 1
-
-    def __make_tail_move(self, state: Day9MoveState, previous_head_position: []) -> None:
-        previous_knot_position = previous_head_position
-        for idx, knot in enumerate(state.knots, 1):
-            if self.__is_tail_knot_move_required(previous_knot_position, knot):
-                knot[0], knot[1] = self.__tail_knot_move(previous_knot_position, knot)
-
-            if idx == len(state.knots):
-                # noinspection PyTypeChecker
-                state.unique_tail_visits.add(tuple(knot))
-
-            previous_knot_position = knot[:]
-
-    def __tail_knot_move(self, head: [], tail: []) -> [int, int]:
-        result = [
-            tail[0] + 1 if head[0] > tail[0] else tail[0] - 1,
-            tail[1] + 1 if head[1] > tail[1] else tail[1] - 1
-        ]
+class Day10StreamParser(StreamParser):
 
-        if head[1] == tail[1]:
-            result[1] = tail[1]
-        elif head[0] == tail[0]:
-            result[0] = tail[0]
+    def __init__(self) -> None:
+        self.program = Day10Program()
 
-        return result
+    def feed(self, block: bytes) -> None:
+        for line in bytes(block).splitlines():
+            if line.strip():
+                self.__compile_operation(line)
 
+    def finish(self) -> Day10Program:
+        return self.program
 
-class Day10ResolverState:
-    def __init__(self) -> None:
-        self.x = 1
-        self.cycles = []
-        self.post_increase = 0
+    def __compile_operation(self, raw_op: bytes) -> None:
+        match raw_op.split():
+            case [b'noop']:
+                self.program.add_instruction(1)
+            case [b'addx', increase] if increase.lstrip(b'-').isdigit():
+                self.program.add_instruction(2, int(increase))
+            case _:
+                raise RuntimeError('Invalid operation format!')
 
 
 class Day10Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    streaming = True
+    options_schema = Day10Options
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        state = Day10ResolverState()
-        self.__cycle_through(problem_input, state)
-        return self.__sum_certain_signals(state, [20, 60, 100, 140, 180, 220])
-
-    def __solve_part_two(self, problem_input: UploadedFile) -> str:
-        state = Day10ResolverState()
-        self.__cycle_through(problem_input, state)
-        return self.__draw(state)
-
-    def __cycle_through(self, problem_input: UploadedFile, state: Day10ResolverState) -> None:
-        for raw_input in problem_input:
-            decoded_line = raw_input.decode().strip()
-            operation, potential_increase = self.__parse_operation(decoded_line)
-
-            match operation:
-                case 'noop':
-                    self.__perform_noop(state)
-                case 'addx':
-                    increase = int(potential_increase)
-                    self.__perform_addx(state, increase)
-
-    def __parse_operation(self, raw_op: str) -> ():
-        matcher = re.match(r'^(noop|addx)\s?(-?\d*)$', raw_op)
-        if matcher:
-            return matcher.groups()
-        else:
-            raise RuntimeError('Invalid operation format!')
+    CRT_WIDTH = 40
 
-    def __perform_noop(self, state: Day10ResolverState) -> None:
-        self.__apply_post_increase(state)
+    def parse(self, problem_input: UploadedFile) -> Day10Program:
+        return self.parse_stream(problem_input)
 
-        state.cycles.append(state.x)  # cycle 1
+    def create_stream_parser(self) -> Day10StreamParser:
+        return Day10StreamParser()
 
-    def __perform_addx(self, state: Day10ResolverState, increase: int) -> None:
-        self.__apply_post_increase(state)
+    def solve_part_one(self, program: Day10Program) -> int:
+        return self.__sum_certain_signals(program, self.options.cycles)
 
-        state.cycles.append(state.x)  # cycle 1
-        state.cycles.append(state.x)  # cycle 2
-        state.post_increase = increase
+    def solve_part_two(self, program: Day10Program) -> str:
+        return self.__draw(program)
 
-    def __sum_certain_signals(self, state: Day10ResolverState, selected_cycles: []) -> int:
+    def __sum_certain_signals(self, program: Day10Program, selected_cycles: []) -> int:
         certain_signals_sum = 0
         for selected_cycle in selected_cycles:
-            if len(state.cycles) >= selected_cycle:
-                certain_signals_sum += state.cycles[selected_cycle - 1] * selected_cycle
+            if program.cycle_count >= selected_cycle:
+                certain_signals_sum += program.get_x(selected_cycle) * selected_cycle
         return certain_signals_sum
 
-    def __apply_post_increase(self, state: Day10ResolverState) -> None:
-        if state.post_increase:
-            state.x += state.post_increase
-            state.post_increase = 0
+    def __draw(self, program: Day10Program) -> str:
+        # Every row ends with line break, pixels of cycle `c` sit at `row * (width + 1) + column`
+        row_size = self.CRT_WIDTH + 1
+        row_count = -(-program.cycle_count // self.CRT_WIDTH)
+        crt = bytearray(b'.' * self.CRT_WIDTH + b'\n') * row_count
 
-    def __draw(self, state: Day10ResolverState) -> str:
-        crt_result = []
-        row = []
+        # Sprite stays in place between register changes, only its three pixels on each row can be lit
+        change_cycles = list(program.change_cycles) + [program.cycle_count + 1]
+        for idx, sprite_position in enumerate(program.x_values):
+            first_pixel, end_pixel = change_cycles[idx] - 1, change_cycles[idx + 1] - 1
+            for row in range(first_pixel // self.CRT_WIDTH, -(-end_pixel // self.CRT_WIDTH)):
+                row_start = row * self.CRT_WIDTH
+                for column in range(max(sprite_position - 1, 0), min(sprite_position + 2, self.CRT_WIDTH)):
+                    if first_pixel <= row_start + column < end_pixel:
+                        crt[row * row_size + column] = ord('#')
 
-        for idx, cycle in enumerate(state.cycles):
-            mid = idx % 40
-
-            if not mid:
-                row = []
-                crt_result.append(row)
-
-            row.append('#') if mid - 1 <= cycle <= mid + 1 else row.append('.')
-
-        new_line = '\n'
-        return f"""{f"{new_line}".join(f"{''.join(row)}" for row in crt_result)}"""
+        # Last row is only as long as there were cycles
+        del crt[program.cycle_count + row_count - 1:]
+        return crt.decode()
 
 
 class Day11Monkey:
@@ -909,13 +1112,16 @@ class Day11Monkey:
     def __init__(self, data: []) -> None:
         self.starting_items = []
         self.operation = ''
+        self.operate = None
         self.transfer_conditions = {
             'rule': 0,
             'true': 0,
             'false': 0
         }
 
-        self.new_worry_calculation = lambda x: math.floor(x // 3)
+        # Kept as plain values instead of lambda, so monkeys can be pickled to worker process
+        self.worry_divisor = 3
+        self.worry_modulus = None
         self.activity = 0
 
         self.__set_starting_items(data)
@@ -930,6 +1136,17 @@ class Day11Monkey:
 \t Monkey activity: {self.activity}
 ---------------------------------------------------"""
 
+    def calculate_new_worry(self, worry_level: int) -> int:
+        if self.worry_modulus:
+            return worry_level % self.worry_modulus
+        return math.floor(worry_level // self.worry_divisor)
+
+    def copy(self) -> 'Day11Monkey':
+        # Only items and activity change during simulation, rest can be shared
+        monkey = copy.copy(self)
+        monkey.starting_items = self.starting_items[:]
+        return monkey
+
     def __set_starting_items(self, data: []) -> None:
         for info in data:
             matcher = re.match(r'^Starting items: ', info)
@@ -952,6 +1169,29 @@ class Day11Monkey:
 
             if matcher:
                 self.operation = matcher[0]
+                self.operate = self.__compile_operation(self.operation)
+
+    def __compile_operation(self, operation: str) -> Callable[[int], int]:
+        # Only forms present in puzzle input are supported, anything else is rejected instead of being executed
+        matcher = re.match(r'^new\s*=\s*old\s*([+*])\s*(old|\d+)$', operation.strip())
+        if not matcher:
+            raise RuntimeError('Invalid operation format!')
+
+        operation_sign, operand = matcher.groups()
+        if operand == 'old':
+            return Day11Monkey.square if operation_sign == '*' else Day11Monkey.double
+        elif operation_sign == '*':
+            return partial(operator.mul, int(operand))
+        else:
+            return partial(operator.add, int(operand))
+
+    @staticmethod
+    def square(worry_level: int) -> int:
+        return worry_level * worry_level
+
+    @staticmethod
+    def double(worry_level: int) -> int:
+        return worry_level + worry_level
 
     def __set_transfer_check(self, data: []) -> None:
         for info in data:
@@ -970,21 +1210,22 @@ class Day11Monkey:
 
 
 class Day11Resolver(Resolver):
-    def resolve(self, problem_input: UploadedFile) -> List[Solution]:
-        return [
-            Solution(part=Part.ONE.value, result=self.__solve_part_one(problem_input)),
-            Solution(part=Part.TWO.value, result=self.__solve_part_two(problem_input)),
-        ]
+    execution_backend = 'process'
+    options_schema = Day11Options
+
+    def parse(self, problem_input: UploadedFile) -> []:
+        return self.__get_monkeys(problem_input)
 
-    def __solve_part_one(self, problem_input: UploadedFile) -> int:
-        monkeys = self.__get_monkeys(problem_input)
+    def copy_parsed_input(self, monkeys: []) -> []:
+        return [monkey.copy() for monkey in monkeys]
+
+    def solve_part_one(self, monkeys: []) -> int:
         self.__run_simulations(monkeys, 20)
         return self.__get_level_of_monkey_business(monkeys)
 
-    def __solve_part_two(self, problem_input: UploadedFile) -> int:
-        monkeys = self.__get_monkeys(problem_input)
+    def solve_part_two(self, monkeys: []) -> int:
         monkeys = self.__set_new_worry_level_calculation(monkeys)
-        self.__run_simulations(monkeys, 10000)
+        self.__run_simulations(monkeys, self.options.rounds)
         return self.__get_level_of_monkey_business(monkeys)
 
     def __get_monkeys(self, problem_input: UploadedFile) -> []:
@@ -995,50 +1236,81 @@ class Day11Resolver(Resolver):
 
     def __get_monkey(self, problem_input: UploadedFile) -> Generator:
         monkey = []
-        for raw_input in problem_input:
-            decoded_line = raw_input.decode().strip()
-
-            # Skip monkey block start
-            monkey_start_matcher = re.match(r'^Monkey (\d+):$', decoded_line)
-            if monkey_start_matcher:
-                continue
-
-            if len(decoded_line) != 0:
-                monkey.append(decoded_line)
-
-            info_rows_per_monkey = 5
-            if len(monkey) == info_rows_per_monkey:
-                yield Day11Monkey(monkey)
-                monkey = []
-
-    def __run_simulations(self, monkeys: [], rounds=1) -> None:
-        for _ in range(rounds):
-            self.__run_simulation(monkeys)
-
-    def __run_simulation(self, monkeys: []) -> None:
-        for monkey in monkeys:
-            self.__play_keep_away(monkey, monkeys)
+        with InputReader(problem_input) as reader:
+            for line in reader.lines():
+                decoded_line = line.decode().strip()
+
+                # Skip monkey block start
+                monkey_start_matcher = re.match(r'^Monkey (\d+):$', decoded_line)
+                if monkey_start_matcher:
+                    continue
+
+                if len(decoded_line) != 0:
+                    monkey.append(decoded_line)
+
+                info_rows_per_monkey = 5
+                if len(monkey) == info_rows_per_monkey:
+                    yield Day11Monkey(monkey)
+                    monkey = []
+
+    def __run_simulations(self, monkeys: [], rounds: int) -> None:
+        # Items never affect each other, so every item is followed on its own through all rounds.
+        # Items starting from the same monkey with the same worry level take the same path.
+        item_walks = {}
+        for monkey_idx, monkey in enumerate(monkeys):
+            for item in monkey.starting_items:
+                if (monkey_idx, item) not in item_walks:
+                    item_walks[(monkey_idx, item)] = self.__play_keep_away(monkeys, monkey_idx, item, rounds)
+
+                for inspecting_monkey, inspections in zip(monkeys, item_walks[(monkey_idx, item)]):
+                    inspecting_monkey.activity += inspections
+            monkey.starting_items = []
 
     # https://en.wikipedia.org/wiki/Keep_away
-    def __play_keep_away(self, monkey: Day11Monkey, monkeys: []) -> None:
-        monkey.activity += len(monkey.starting_items)
-        for item in monkey.starting_items:
-            old = item
-            _locals = locals()
-
-            exec(monkey.operation, globals(), _locals)
-            item_new_worry_level = _locals['new']
-
-            item_new_worry_level = monkey.new_worry_calculation(item_new_worry_level)
-
-            if item_new_worry_level % monkey.transfer_conditions['rule']:
-                receiving_monkey = monkeys[monkey.transfer_conditions['false']]
-            else:
-                receiving_monkey = monkeys[monkey.transfer_conditions['true']]
-
-            receiving_monkey.starting_items.append(item_new_worry_level)
-
-        monkey.starting_items = []
+    def __play_keep_away(self, monkeys: [], monkey_idx: int, worry_level: int, rounds: int) -> []:
+        """
+        Counts inspections of single item per monkey. Item state at round start is its monkey and worry level,
+        once state repeats remaining rounds are a repetition of already seen ones.
+        """
+        inspections = [0] * len(monkeys)
+        seen_states = {}
+        round_walks = []
+        # Attribute and dict lookups are resolved once, inner loop runs for every inspection
+        throws = [(monkey.operate, monkey.calculate_new_worry, monkey.transfer_conditions['rule'],
+                   monkey.transfer_conditions['true'], monkey.transfer_conditions['false']) for monkey in monkeys]
+
+        for round_idx in range(rounds):
+            state = (monkey_idx, worry_level)
+            if state in seen_states:
+                self.__repeat_cycle(inspections, round_walks, seen_states[state], rounds - round_idx)
+                break
+            seen_states[state] = round_idx
+
+            # Item thrown to monkey with higher index is inspected again in the same round
+            round_walk = []
+            while True:
+                operate, calculate_new_worry, rule, if_true, if_false = throws[monkey_idx]
+                round_walk.append(monkey_idx)
+                inspections[monkey_idx] += 1
+                worry_level = calculate_new_worry(operate(worry_level))
+
+                previous_monkey_idx = monkey_idx
+                monkey_idx = if_false if worry_level % rule else if_true
+                if monkey_idx <= previous_monkey_idx:
+                    break
+
+            round_walks.append(round_walk)
+
+        return inspections
+
+    def __repeat_cycle(self, inspections: [], round_walks: [], cycle_start: int, remaining_rounds: int) -> None:
+        cycle = round_walks[cycle_start:]
+        full_cycles, partial_cycle = divmod(remaining_rounds, len(cycle))
+
+        for cycle_round_idx, round_walk in enumerate(cycle):
+            repeats = full_cycles + (cycle_round_idx < partial_cycle)
+            for inspecting_monkey_idx in round_walk:
+                inspections[inspecting_monkey_idx] += repeats
 
     def __get_level_of_monkey_business(self, monkeys: []) -> int:
         ranked_monkeys = sorted(monkeys, key=lambda x: x.activity, reverse=True)
@@ -1052,6 +1324,6 @@ class Day11Resolver(Resolver):
             mod_all *= monkey.transfer_conditions['rule']
 
         for monkey in monkeys:
-            monkey.new_worry_calculation = lambda x: x % mod_all
+            monkey.worry_modulus = mod_all
 
         return monkeys